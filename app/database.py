@@ -0,0 +1,76 @@
+# app/database.py
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import conexion
+from app.instrumentation import instrumentar_engine
+
+# El dialecto debe coincidir con el driver de conexion.py (mysql.connector).
+# Para pruebas con SQLite: DB_URL=sqlite:// y conexion.configurar_pool(creador=...).
+DB_URL = os.getenv("DB_URL", "mysql+mysqlconnector://")
+
+# El pooling lo hace conexion.PoolConexiones: SQLAlchemy no mantiene su propio
+# pool (NullPool) y al "cerrar" la conexión ésta vuelve al pool compartido.
+engine = create_engine(DB_URL, creator=conexion.conectar, poolclass=NullPool)
+instrumentar_engine(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_db():
+    """Dependencia de FastAPI: entrega una sesión y la cierra al terminar."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# ----------------- Camino asíncrono (asyncio) -----------------
+
+# Driver asyncio (aiomysql). Las conexiones async no pueden salir del pool de
+# conexion.py (es bloqueante), así que tienen su propio pool de SQLAlchemy con
+# un presupuesto aparte: el proceso abre como máximo
+# DB_POOL_SIZE (camino síncrono) + ASYNC_DB_POOL_SIZE (camino async) conexiones.
+ASYNC_DB_URL = os.getenv("ASYNC_DB_URL") or URL.create(
+    "mysql+aiomysql",
+    username=conexion.DB_CONFIG["user"],
+    password=conexion.DB_CONFIG["password"],
+    host=conexion.DB_CONFIG["host"],
+    database=conexion.DB_CONFIG["database"],
+)
+
+ASYNC_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", str(conexion.POOL_SIZE)))
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    """Crea el engine async la primera vez (el driver solo se importa si se usa)."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        opciones = {}
+        if not str(ASYNC_DB_URL).startswith("sqlite"):
+            opciones = dict(
+                pool_size=ASYNC_POOL_SIZE,
+                max_overflow=0,  # sin conexiones extra por encima del tamaño
+                pool_timeout=conexion.POOL_TIMEOUT,
+                pool_recycle=conexion.POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+        _async_engine = create_async_engine(ASYNC_DB_URL, **opciones)
+        instrumentar_engine(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+async def get_async_db():
+    """Dependencia de FastAPI: entrega una AsyncSession y la cierra al terminar."""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,273 @@
+# app/instrumentation.py
+"""Instrumentación de rendimiento: latencias por endpoint, consultas por petición,
+log de consultas lentas / patrones N+1 y exportación en formato Prometheus.
+
+- `MetricsMiddleware`: middleware ASGI que mide cada petición.
+- `instrumentar_engine(engine)`: engancha los eventos de SQLAlchemy.
+- `render_prometheus()`: texto para el endpoint /metrics.
+- Perfilado opcional: con PROFILING_ENABLED=1, la cabecera `X-Profile: 1`
+  devuelve un resumen de pyinstrument (o cProfile si no está instalado)
+  en lugar de la respuesta normal.
+"""
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import event
+
+logger = logging.getLogger("gestion_salud.performance")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+class Histograma:
+    """Histograma acumulativo con buckets fijos (compatible con Prometheus)."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * len(buckets)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.suma += valor
+        self.total += 1
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+                break
+
+    def lineas(self, nombre, etiquetas):
+        acumulado = 0
+        for limite, conteo in zip(self.buckets, self.conteos):
+            acumulado += conteo
+            yield f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}'
+        yield f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {self.total}'
+        yield f'{nombre}_sum{{{etiquetas}}} {self.suma}'
+        yield f'{nombre}_count{{{etiquetas}}} {self.total}'
+
+class EstadisticasPeticion:
+    """Datos de base de datos acumulados durante una petición."""
+
+    __slots__ = ("consultas", "tiempo_db", "sentencias", "n_plus_one")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.sentencias = Counter()
+        self.n_plus_one = set()
+
+_peticion_actual = contextvars.ContextVar("peticion_actual", default=None)
+
+_lock = threading.Lock()
+_latencias = defaultdict(lambda: Histograma(LATENCY_BUCKETS))
+_consultas = defaultdict(lambda: Histograma(QUERY_COUNT_BUCKETS))
+_tiempo_db = defaultdict(lambda: Histograma(LATENCY_BUCKETS))
+_peticiones = Counter()
+_contadores = Counter()
+
+# ----------------- Eventos de SQLAlchemy -----------------
+
+def _redactar(parametros):
+    """Describe los parámetros sin exponer sus valores (datos de pacientes)."""
+    if not parametros:
+        return "sin parámetros"
+    if isinstance(parametros, (list, tuple)) and parametros and isinstance(parametros[0], (dict, list, tuple)):
+        return f"executemany de {len(parametros)} filas [redactado]"
+    if isinstance(parametros, dict):
+        return "{" + ", ".join(f"{k}=?" for k in parametros) + "}"
+    return f"{len(parametros)} valores [redactado]"
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_inicio_consulta", []).append((context, time.perf_counter()))
+
+def _error_al_ejecutar(contexto):
+    """Quita la marca de inicio de una sentencia que falló (no llega a after_cursor_execute)."""
+    if contexto.connection is None:
+        return
+    inicios = contexto.connection.info.get("_inicio_consulta")
+    # Solo si la marca es de esta sentencia: un error al leer resultados llega
+    # después de after_cursor_execute, cuando la marca ya se quitó
+    if inicios and inicios[-1][0] is contexto.execution_context:
+        inicios.pop()
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    duracion = time.perf_counter() - conn.info["_inicio_consulta"].pop()[1]
+    with _lock:
+        _contadores["db_queries_total"] += 1
+    if duracion * 1000 >= SLOW_QUERY_MS:
+        with _lock:
+            _contadores["db_slow_queries_total"] += 1
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s -- %s", duracion * 1000, statement, _redactar(parameters)
+        )
+    stats = _peticion_actual.get()
+    if stats is None:
+        return
+    stats.consultas += 1
+    stats.tiempo_db += duracion
+    stats.sentencias[statement] += 1
+    if stats.sentencias[statement] == N_PLUS_ONE_THRESHOLD and statement not in stats.n_plus_one:
+        stats.n_plus_one.add(statement)
+        with _lock:
+            _contadores["db_n_plus_one_total"] += 1
+        logger.warning(
+            "Posible patrón N+1: la misma consulta se ejecutó %d veces en una petición: %s",
+            N_PLUS_ONE_THRESHOLD, statement,
+        )
+
+def instrumentar_engine(engine):
+    """Registra los eventos de medición en un Engine (o en AsyncEngine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.listen(engine, "handle_error", _error_al_ejecutar)
+    return engine
+
+# ----------------- Middleware ASGI -----------------
+
+# cProfile y pyinstrument no admiten dos perfiles a la vez en el proceso
+_perfil_lock = threading.Lock()
+
+def _perfilar_inicio():
+    try:
+        from pyinstrument import Profiler  # dependencia opcional
+    except ImportError:
+        perfil = cProfile.Profile()
+        perfil.enable()
+        return perfil
+    perfil = Profiler(async_mode="enabled")
+    perfil.start()
+    return perfil
+
+def _perfilar_resumen(perfil) -> str:
+    if isinstance(perfil, cProfile.Profile):
+        perfil.disable()
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(40)
+        return salida.getvalue()
+    perfil.stop()
+    return perfil.output_text(unicode=True)
+
+async def _enviar_texto(send, status: int, cuerpo: bytes, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(cuerpo)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": cuerpo})
+
+class MetricsMiddleware:
+    """Mide latencia, número de consultas y tiempo de BD por endpoint."""
+
+    def __init__(self, app, profiling_enabled: bool = PROFILING_ENABLED):
+        self.app = app
+        self.profiling_enabled = profiling_enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        perfilar = self.profiling_enabled and (b"x-profile", b"1") in scope.get("headers", [])
+        if perfilar and not _perfil_lock.acquire(blocking=False):
+            await _enviar_texto(send, 409, "Ya hay un perfilado en curso; reintente más tarde.\n".encode())
+            return
+
+        stats = EstadisticasPeticion()
+        token = _peticion_actual.set(stats)
+        estado = {"status": 500}
+        perfil = None
+
+        async def send_medido(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["status"] = mensaje["status"]
+            if not perfilar:
+                await send(mensaje)
+
+        inicio = time.perf_counter()
+        try:
+            if perfilar:
+                perfil = _perfilar_inicio()
+            await self.app(scope, receive, send_medido)
+        finally:
+            duracion = time.perf_counter() - inicio
+            _peticion_actual.reset(token)
+            ruta = scope.get("route")
+            endpoint = getattr(ruta, "path", "sin_ruta")
+            clave = (scope["method"], endpoint)
+            with _lock:
+                _latencias[clave].observar(duracion)
+                _consultas[clave].observar(stats.consultas)
+                _tiempo_db[clave].observar(stats.tiempo_db)
+                _peticiones[clave + (str(estado["status"]),)] += 1
+            if perfilar:
+                try:
+                    if perfil is not None:
+                        resumen = _perfilar_resumen(perfil)
+                finally:
+                    _perfil_lock.release()
+
+        if perfilar:
+            cuerpo = (
+                f"{scope['method']} {scope['path']} -> {estado['status']} en {duracion * 1000:.1f} ms, "
+                f"{stats.consultas} consultas ({stats.tiempo_db * 1000:.1f} ms en BD)\n\n"
+                + resumen
+            ).encode()
+            await _enviar_texto(send, 200, cuerpo, [
+                (b"x-profile-original-status", str(estado["status"]).encode()),
+            ])
+
+# ----------------- Exportación Prometheus -----------------
+
+def _etiquetas(method, endpoint):
+    endpoint = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",endpoint="{endpoint}"'
+
+def render_prometheus(gauges=None, contadores=None) -> str:
+    """Texto en formato de exposición de Prometheus.
+
+    `gauges` y `contadores` son dicts {nombre_métrica: valor} adicionales (ej.
+    métricas del pool de conexiones o de la caché); los contadores se exportan
+    con el sufijo `_total`.
+    """
+    lineas = []
+    with _lock:
+        lineas += ["# HELP http_requests_total Peticiones HTTP atendidas.",
+                   "# TYPE http_requests_total counter"]
+        for (method, endpoint, status), total in sorted(_peticiones.items()):
+            lineas.append(f'http_requests_total{{{_etiquetas(method, endpoint)},status="{status}"}} {total}')
+        for nombre, ayuda, tabla in (
+            ("http_request_duration_seconds", "Latencia por endpoint.", _latencias),
+            ("http_request_db_queries", "Consultas SQL por petición.", _consultas),
+            ("http_request_db_seconds", "Tiempo en base de datos por petición.", _tiempo_db),
+        ):
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} histogram"]
+            for (method, endpoint), histograma in sorted(tabla.items()):
+                lineas += histograma.lineas(nombre, _etiquetas(method, endpoint))
+        for nombre in ("db_queries_total", "db_slow_queries_total", "db_n_plus_one_total"):
+            lineas += [f"# TYPE {nombre} counter", f"{nombre} {_contadores[nombre]}"]
+    for nombre, valor in sorted((gauges or {}).items()):
+        lineas += [f"# TYPE {nombre} gauge", f"{nombre} {valor}"]
+    for nombre, valor in sorted((contadores or {}).items()):
+        lineas += [f"# TYPE {nombre}_total counter", f"{nombre}_total {valor}"]
+    return "\n".join(lineas) + "\n"
+
+def reset_metricas():
+    """Limpia todas las métricas acumuladas (útil en pruebas)."""
+    with _lock:
+        for tabla in (_latencias, _consultas, _tiempo_db, _peticiones, _contadores):
+            tabla.clear()
@@ -0,0 +1,5 @@
+# app/models/base.py
+from sqlalchemy.orm import declarative_base
+
+# Clase base declarativa compartida por todos los modelos
+Base = declarative_base()
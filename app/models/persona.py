@@ -1,10 +1,26 @@
 # app/models/persona.py
-from sqlalchemy import Column, Integer, String, Date, Enum
+import unicodedata
+
+from sqlalchemy import Column, Integer, String, Date, Enum, Index
+from sqlalchemy.orm import validates
 from app.models.base import Base # Base es la clase base declarativa de SQLAlchemy
 
+def normalizar_texto(texto):
+    """Minúsculas y sin acentos, para búsquedas insensibles a mayúsculas/acentos."""
+    if texto is None:
+        return None
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower().strip()
+
+def _default_normalizado(columna):
+    # Default de Core: cubre también los INSERT masivos que no pasan por el ORM
+    def default(context):
+        return normalizar_texto(context.get_current_parameters().get(columna))
+    return default
+
 class PersonaAtendida(Base):
     """Corresponde a la entidad PersonasAtendidas (Pacientes) - Sección 2.1"""
-    
+
     # 1. Nombre de la tabla en MySQL
     __tablename__ = 'PersonasAtendidas'
 
@@ -14,7 +30,22 @@ class PersonaAtendida(Base):
     numeroDocumento = Column(String(20), unique=True, nullable=False, index=True)
     nombres = Column(String(100), nullable=False)
     apellidos = Column(String(100), nullable=False)
-    fechaNacimiento = Column(Date, nullable=False)
+    fechaNacimiento = Column(Date, nullable=False, index=True)
     sexo = Column(Enum('M', 'F', 'Otro'), nullable=False)
     # ... otras columnas
-    estado = Column(Enum('activo', 'inactivo'), default='activo', nullable=False)
\ No newline at end of file
+    estado = Column(Enum('activo', 'inactivo'), default='activo', nullable=False)
+
+    # 3. Columnas normalizadas para búsqueda (migrations/001_busqueda_personas.py)
+    nombresNormalizado = Column(String(100), nullable=False, default=_default_normalizado('nombres'))
+    apellidosNormalizado = Column(String(100), nullable=False, default=_default_normalizado('apellidos'))
+
+    __table_args__ = (
+        # Búsqueda por prefijo de apellidos (+ nombres) con orden por índice
+        Index('ix_personas_busqueda_apellidos', 'apellidosNormalizado', 'nombresNormalizado'),
+        Index('ix_personas_busqueda_nombres', 'nombresNormalizado', 'apellidosNormalizado'),
+    )
+
+    @validates('nombres', 'apellidos')
+    def _sincronizar_normalizado(self, key, valor):
+        setattr(self, f'{key}Normalizado', normalizar_texto(valor))
+        return valor
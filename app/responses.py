@@ -0,0 +1,59 @@
+# app/responses.py
+"""Serialización rápida de listados: filas de BD -> JSON sin pasar por Pydantic.
+
+Las filas vienen de la base de datos (datos confiables y con los tipos del
+esquema), así que se codifican directamente con orjson (o json si no está
+instalado). Incluye ETag / If-None-Match: si la página no cambió se responde
+304 sin serializar nada.
+"""
+import hashlib
+import json
+from datetime import date
+from typing import Any, Sequence
+
+from fastapi import Request, Response
+
+try:
+    import orjson  # dependencia opcional
+except ImportError:
+    orjson = None
+
+def campos_de(schema) -> list:
+    """Nombres de campos de un modelo Pydantic, en orden de declaración."""
+    return list(schema.model_fields)
+
+def _default(valor):
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+def dumps(contenido: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(contenido)
+    return json.dumps(contenido, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def filas_a_dicts(filas: Sequence[Sequence], campos: Sequence[str]) -> list:
+    return [dict(zip(campos, fila)) for fila in filas]
+
+def calcular_etag(*partes) -> str:
+    """ETag débil a partir de las tuplas crudas (más barato que serializar)."""
+    return 'W/"' + hashlib.blake2b(repr(partes).encode(), digest_size=16).hexdigest() + '"'
+
+def _coincide(request: Request, etag: str) -> bool:
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    return cabecera.strip() == "*" or etag in (v.strip() for v in cabecera.split(","))
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def respuesta_rapida(request: Request, etag: str, construir) -> Response:
+    """Devuelve 304 si el cliente ya tiene `etag`; si no, serializa `construir()`."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _coincide(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(construir(), headers=headers)
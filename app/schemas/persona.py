@@ -0,0 +1,40 @@
+# app/schemas/persona.py
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+class PersonaBase(BaseModel):
+    tipoDocumento: str
+    numeroDocumento: str
+    nombres: str
+    apellidos: str
+    fechaNacimiento: date
+    sexo: Literal['M', 'F', 'Otro']
+
+class PersonaCreate(PersonaBase):
+    pass
+
+class PersonaResponse(PersonaBase):
+    id: int
+    estado: Literal['activo', 'inactivo']
+
+    model_config = ConfigDict(from_attributes=True)
+
+class PersonaPage(BaseModel):
+    """Página de resultados con paginación por cursor (keyset)."""
+    items: List[PersonaResponse]
+    next_cursor: Optional[str] = None
+
+class PersonaBulkFila(BaseModel):
+    """Resultado de una fila en la carga masiva."""
+    fila: int
+    numeroDocumento: Optional[str] = None
+    estado: Literal['creada', 'conflicto', 'error']
+    detalle: Optional[str] = None
+
+class PersonaBulkReport(BaseModel):
+    creadas: int
+    conflictos: int
+    errores: int
+    filas: List[PersonaBulkFila]
@@ -1,39 +1,283 @@
 # app/routers/personas.py (ARCHIVO MODIFICADO)
-from fastapi import APIRouter, Depends, HTTPException, status
+import codecs
+import csv
+import io
+import json
+from collections import deque
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
-from app.database import get_db
-from app.schemas.persona import PersonaCreate, PersonaResponse
+from app.database import SessionLocal, get_async_db, get_db
+from app.schemas.persona import (
+    PersonaBulkReport, PersonaCreate, PersonaPage, PersonaResponse
+)
 from app.services import persona_service # Importar el servicio
+from app import responses
 
 router = APIRouter(
     prefix="/personas",
     tags=["2.1 Identidades - Personas Atendidas"]
 )
 
+# Columnas que se leen de la BD para los listados (los campos de PersonaResponse)
+RESPONSE_CAMPOS = responses.campos_de(PersonaResponse)
+
 # ----------------- Endpoints (Controladores) -----------------
 
 @router.post("/", response_model=PersonaResponse, status_code=status.HTTP_201_CREATED)
-def alta_persona(persona: PersonaCreate, db: Session = Depends(get_db)):
+async def alta_persona(persona: PersonaCreate, db: AsyncSession = Depends(get_async_db)):
     """[POST] Crea una nueva Persona Atendida (Paciente)."""
     
     # 1. Llamada al Servicio para validar unicidad (Lógica de Negocio)
-    db_persona_existente = persona_service.get_persona_by_document(db, persona.numeroDocumento)
+    db_persona_existente = await persona_service.get_persona_by_document_async(db, persona.numeroDocumento)
     if db_persona_existente:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Error: Ya existe una persona registrada con ese número de documento."
         )
     
-    # 2. Llamada al Servicio para crear
-    return persona_service.create_persona(db=db, persona=persona)
+    # 2. Llamada al Servicio para crear (el índice único tiene la última palabra:
+    # la verificación anterior puede venir de una caché negativa desactualizada)
+    try:
+        return await persona_service.create_persona_async(db=db, persona=persona)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Error: Ya existe una persona registrada con ese número de documento."
+        )
+
+async def _leer_lineas_crudas(request: Request):
+    """Lee el cuerpo de la petición en streaming y lo entrega línea a línea, con su fin de línea."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pendiente = ""
+    async for bloque in request.stream():
+        pendiente += decoder.decode(bloque)
+        *lineas, pendiente = pendiente.split("\n")
+        for linea in lineas:
+            yield linea + "\n"
+    pendiente += decoder.decode(b"", final=True)
+    if pendiente:
+        yield pendiente
+
+async def _leer_lineas(request: Request):
+    """Como _leer_lineas_crudas, sin fin de línea y omitiendo las líneas vacías."""
+    async for linea in _leer_lineas_crudas(request):
+        if linea.strip():
+            yield linea.rstrip("\r\n")
+
+class _ColaLineas:
+    """Iterador de líneas para csv.reader que se agota al vaciarse y se reanuda al recibir más."""
+
+    def __init__(self):
+        self.lineas = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.lineas:
+            raise StopIteration
+        return self.lineas.popleft()
+
+async def _leer_filas_csv(request: Request):
+    """Entrega las filas del CSV con un solo csv.reader sobre el cuerpo en streaming.
+
+    Un campo entre comillas puede contener saltos de línea: las líneas se
+    encolan por registros completos (comillas pareadas) para que el lector
+    no se quede sin datos a mitad de uno.
+    """
+    cola = _ColaLineas()
+    lector = csv.reader(cola)
+    comillas = 0
+    async for linea in _leer_lineas_crudas(request):
+        cola.lineas.append(linea)
+        comillas += linea.count('"')
+        if comillas % 2 == 0:
+            comillas = 0
+            for valores in lector:
+                if valores:
+                    yield valores
+    for valores in lector:  # comillas sin cerrar al final del cuerpo
+        if valores:
+            yield valores
+
+async def _leer_registros(request: Request):
+    """Entrega diccionarios según el Content-Type: JSON (arreglo), NDJSON o CSV."""
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    if content_type == "application/json":
+        try:
+            datos = await request.json()
+        except ValueError:  # incluye JSONDecodeError y UnicodeDecodeError
+            datos = None
+        if not isinstance(datos, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Se esperaba un arreglo JSON de personas"
+            )
+        for registro in datos:
+            yield registro
+    elif content_type in ("application/x-ndjson", "application/ndjson"):
+        async for linea in _leer_lineas(request):
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                yield None
+    elif content_type == "text/csv":
+        encabezado = None
+        async for valores in _leer_filas_csv(request):
+            if encabezado is None:
+                encabezado = valores
+            else:
+                yield dict(zip(encabezado, valores))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Formatos admitidos: application/json, application/x-ndjson, text/csv"
+        )
+
+@router.post("/bulk", response_model=PersonaBulkReport)
+async def alta_personas_bulk(
+    request: Request,
+    chunk_size: int = Query(persona_service.BULK_CHUNK_SIZE, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """[POST] Carga masiva de personas (JSON, NDJSON o CSV) con reporte por fila."""
+    filas = []
+    lote, numeros = [], []
+
+    async def procesar_lote():
+        # El servicio numera el lote desde 0; se traduce al número de fila original
+        reporte = await run_in_threadpool(
+            persona_service.bulk_create_personas, db, lote, chunk_size
+        )
+        for fila in reporte:
+            fila["fila"] = numeros[fila["fila"]]
+        filas.extend(reporte)
+
+    n = 0
+    async for registro in _leer_registros(request):
+        try:
+            lote.append(PersonaCreate.model_validate(registro))
+            numeros.append(n)
+        except ValidationError as exc:
+            errores = exc.errors()
+            filas.append({
+                "fila": n,
+                "numeroDocumento": registro.get("numeroDocumento") if isinstance(registro, dict) else None,
+                "estado": "error",
+                "detalle": errores[0]["msg"] if errores else "Fila inválida",
+            })
+        n += 1
+        if len(lote) >= chunk_size:
+            await procesar_lote()
+            lote, numeros = [], []
+    if lote:
+        await procesar_lote()
+    filas.sort(key=lambda f: f["fila"])
+    return PersonaBulkReport(
+        creadas=sum(f["estado"] == "creada" for f in filas),
+        conflictos=sum(f["estado"] == "conflicto" for f in filas),
+        errores=sum(f["estado"] == "error" for f in filas),
+        filas=filas,
+    )
+
+@router.get("/search", response_model=List[PersonaResponse])
+async def buscar_personas(
+    nombres: Optional[str] = Query(None, min_length=1, max_length=100),
+    apellidos: Optional[str] = Query(None, min_length=1, max_length=100),
+    documento: Optional[str] = Query(None, min_length=1, max_length=20),
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    limit: int = Query(20, ge=1, le=persona_service.SEARCH_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """[GET] Busca personas por prefijo de nombres, apellidos o documento y rango de nacimiento."""
+    if not any((nombres, apellidos, documento, fecha_desde, fecha_hasta)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar al menos un criterio de búsqueda"
+        )
+    return await persona_service.search_personas_async(
+        db,
+        limit=limit,
+        nombres=nombres,
+        apellidos=apellidos,
+        documento=documento,
+        fecha_desde=fecha_desde,
+        fecha_hasta=fecha_hasta,
+    )
+
+@router.get("/keyset", response_model=PersonaPage)
+async def listar_personas_keyset(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """[GET] Lista personas con paginación por cursor (usar next_cursor para la siguiente página)."""
+    try:
+        filas, next_cursor = await persona_service.get_personas_keyset_filas_async(
+            db, RESPONSE_CAMPOS, cursor=cursor, limit=limit
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    return responses.respuesta_rapida(
+        request,
+        responses.calcular_etag(filas, next_cursor),
+        lambda: {"items": responses.filas_a_dicts(filas, RESPONSE_CAMPOS), "next_cursor": next_cursor},
+    )
+
+def _exportar_filas(formato: str, batch_size: int):
+    """Genera la exportación fila a fila; abre su propia sesión porque se
+    consume después de que el endpoint retorna."""
+    db = SessionLocal()
+    try:
+        if formato == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=RESPONSE_CAMPOS)
+            writer.writeheader()
+            yield buffer.getvalue()
+        for persona in persona_service.iter_personas(db, batch_size=batch_size):
+            fila = PersonaResponse.model_validate(persona).model_dump(mode="json")
+            if formato == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerow(fila)
+                yield buffer.getvalue()
+            else:
+                yield json.dumps(fila, ensure_ascii=False) + "\n"
+    finally:
+        db.close()
+
+@router.get("/export")
+async def exportar_personas(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(1000, ge=1, le=10000),
+):
+    """[GET] Exporta todas las personas en streaming (NDJSON o CSV) con memoria constante."""
+    media_type = "text/csv" if formato == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _exportar_filas(formato, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="personas.{formato}"'},
+    )
 
 @router.get("/{persona_id}", response_model=PersonaResponse)
-def consulta_persona(persona_id: int, db: Session = Depends(get_db)):
+async def consulta_persona(persona_id: int, db: AsyncSession = Depends(get_async_db)):
     """[GET] Consulta los datos de una persona por su ID."""
     
-    db_persona = persona_service.get_persona(db, persona_id=persona_id) # Llamada al Servicio
+    db_persona = await persona_service.get_persona_async(db, persona_id=persona_id) # Llamada al Servicio
     if db_persona is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -42,6 +286,26 @@ def consulta_persona(persona_id: int, db: Session = Depends(get_db)):
     return db_persona
     
 @router.get("/", response_model=List[PersonaResponse])
-def listar_personas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """[GET] Lista personas con paginación."""
-    return persona_service.get_personas(db, skip=skip, limit=limit) # Llamada al Servicio
\ No newline at end of file
+async def listar_personas(
+    request: Request, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)
+):
+    """[GET] Lista personas con paginación (solo las columnas de la respuesta, con ETag)."""
+    filas = await persona_service.get_personas_filas_async(
+        db, RESPONSE_CAMPOS, skip=skip, limit=limit
+    ) # Llamada al Servicio
+    return responses.respuesta_rapida(
+        request,
+        responses.calcular_etag(filas),
+        lambda: responses.filas_a_dicts(filas, RESPONSE_CAMPOS),
+    )
+
+@router.patch("/{persona_id}/desactivar", response_model=PersonaResponse)
+async def desactivar_persona(persona_id: int, db: AsyncSession = Depends(get_async_db)):
+    """[PATCH] Cambia el estado de una persona a 'inactivo'."""
+    db_persona = await persona_service.deactivate_persona_async(db, persona_id=persona_id)
+    if db_persona is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Persona no encontrada"
+        )
+    return db_persona
@@ -0,0 +1,194 @@
+# app/services/cache.py
+"""Caché de lectura para consultas frecuentes (ej. personas por ID o documento).
+
+Backends intercambiables:
+- MemoryCache: LRU en proceso con TTL y tamaño máximo.
+- RedisCache: cualquier cliente con la interfaz get/set(ex=)/delete de redis-py
+  (valores en JSON).
+
+Las variantes aget/aset/adelete son para el camino asíncrono: por defecto
+ejecutan la operación en un hilo para no bloquear el event loop con E/S de red.
+"""
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Marca para guardar búsquedas sin resultado (caché negativa)
+NEGATIVO = "__negativo__"
+
+class CacheBackend(ABC):
+    """Interfaz común de los backends de caché."""
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "sets": 0, "deletes": 0}
+
+    def _contar(self, nombre: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[nombre] += n
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Devuelve (encontrado, valor)."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda `value`; `ttl` en segundos (None = TTL del backend)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Elimina la clave (no falla si no existe)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Vacía la caché."""
+
+    async def aget(self, key: str) -> Tuple[bool, Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def adelete(self, key: str) -> None:
+        await asyncio.to_thread(self.delete, key)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+class MemoryCache(CacheBackend):
+    """LRU en memoria con expiración por TTL, seguro para varios hilos."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expira, valor)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entrada = self._data.get(key)
+            if entrada is not None:
+                expira, valor = entrada
+                if expira > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._contar("hits")
+                    return True, valor
+                del self._data[key]
+        self._contar("misses")
+        return False, None
+
+    def set(self, key, value, ttl=None):
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expira, value)
+            self._data.move_to_end(key)
+            desalojadas = 0
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                desalojadas += 1
+        self._contar("sets")
+        if desalojadas:
+            self._contar("evictions", desalojadas)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+        self._contar("deletes")
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    # Sin E/S: no vale la pena pasar por un hilo
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value, ttl=None):
+        self.set(key, value, ttl)
+
+    async def adelete(self, key):
+        self.delete(key)
+
+    def stats(self):
+        datos = super().stats()
+        with self._lock:
+            datos["size"] = len(self._data)
+        return datos
+
+# Fechas como {"__date__": "AAAA-MM-DD"}: JSON no las soporta y pickle no es
+# seguro si otro proceso puede escribir en Redis
+def _codificar(valor):
+    if isinstance(valor, datetime.datetime):
+        return {"__datetime__": valor.isoformat()}
+    if isinstance(valor, datetime.date):
+        return {"__date__": valor.isoformat()}
+    raise TypeError(f"Tipo no serializable en caché: {type(valor).__name__}")
+
+def _decodificar(objeto):
+    if len(objeto) == 1:
+        if "__date__" in objeto:
+            return datetime.date.fromisoformat(objeto["__date__"])
+        if "__datetime__" in objeto:
+            return datetime.datetime.fromisoformat(objeto["__datetime__"])
+    return objeto
+
+class RedisCache(CacheBackend):
+    """Backend externo sobre un cliente tipo redis-py (los desalojos los hace Redis)."""
+
+    def __init__(self, client, prefix: str = "gestion_salud:", ttl: float = 300):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self._contar("misses")
+            return False, None
+        self._contar("hits")
+        return True, json.loads(raw, object_hook=_decodificar)
+
+    def set(self, key, value, ttl=None):
+        segundos = max(1, int(round(self.ttl if ttl is None else ttl)))
+        self.client.set(self.prefix + key, json.dumps(value, default=_codificar), ex=segundos)
+        self._contar("sets")
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+        self._contar("deletes")
+
+    def clear(self):
+        claves = list(self.client.scan_iter(self.prefix + "*"))
+        if claves:
+            self.client.delete(*claves)
+
+def _crear_desde_entorno() -> CacheBackend:
+    """CACHE_URL=redis://... usa Redis; si no, caché en memoria."""
+    ttl = float(os.getenv("CACHE_TTL", "300"))
+    url = os.getenv("CACHE_URL")
+    if url:
+        import redis  # dependencia opcional
+        return RedisCache(redis.Redis.from_url(url), ttl=ttl)
+    return MemoryCache(max_size=int(os.getenv("CACHE_MAX_SIZE", "10000")), ttl=ttl)
+
+_cache: Optional[CacheBackend] = None
+
+def get_cache() -> CacheBackend:
+    global _cache
+    if _cache is None:
+        _cache = _crear_desde_entorno()
+    return _cache
+
+def set_cache(backend: CacheBackend) -> None:
+    """Reemplaza el backend activo (ej. en pruebas)."""
+    global _cache
+    _cache = backend
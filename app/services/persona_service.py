@@ -1,25 +1,157 @@
 # app/services/persona_service.py
-from sqlalchemy.orm import Session
-from app.models.persona import PersonaAtendida
+import base64
+import json
+import os
+from itertools import islice
+from datetime import date
+from sqlalchemy import Row, insert, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.models.persona import PersonaAtendida, normalizar_texto
 from app.schemas.persona import PersonaCreate
-from typing import List
+from app.services.cache import NEGATIVO, get_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# TTL corto para búsquedas sin resultado (ej. verificación de documento en alta_persona)
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "5"))
+
+_COLUMNAS = PersonaAtendida.__table__.columns.keys()
+
+def _key_id(persona_id: int) -> str:
+    return f"persona:id:{persona_id}"
+
+def _key_doc(doc_num: str) -> str:
+    return f"persona:doc:{doc_num}"
+
+def _datos(persona: PersonaAtendida) -> dict:
+    return {c: getattr(persona, c) for c in _COLUMNAS}
+
+def _desde_cache(hit: bool, datos):
+    """Convierte una lectura de caché en (encontrado, persona desasociada o None)."""
+    if not hit or datos == NEGATIVO:
+        return hit, None
+    persona = PersonaAtendida(**datos)
+    make_transient_to_detached(persona)
+    return True, persona
+
+def _cachear(persona: PersonaAtendida) -> None:
+    """Guarda (o refresca) la persona en caché bajo su ID y su documento."""
+    datos = _datos(persona)
+    cache = get_cache()
+    cache.set(_key_id(persona.id), datos)
+    cache.set(_key_doc(persona.numeroDocumento), datos)
+
+def _leer_cache(key: str):
+    """Devuelve (encontrado, persona desasociada de toda sesión o None)."""
+    return _desde_cache(*get_cache().get(key))
+
+def _guardar_resultado(key: str, persona: Optional[PersonaAtendida]) -> None:
+    if persona is None:
+        get_cache().set(key, NEGATIVO, ttl=CACHE_NEGATIVE_TTL)
+    else:
+        _cachear(persona)
+
+def _buscar(db: Session, key: str, criterio):
+    hit, persona = _leer_cache(key)
+    if hit:
+        # merge(load=False) asocia la persona a la sesión sin ir a la BD
+        return db.merge(persona, load=False) if persona is not None else None
+    persona = db.query(PersonaAtendida).filter(criterio).first()
+    _guardar_resultado(key, persona)
+    return persona
 
 def get_persona_by_document(db: Session, doc_num: str):
     """Verifica la unicidad del documento (Regla de Negocio)."""
-    return db.query(PersonaAtendida).filter(
-        PersonaAtendida.numeroDocumento == doc_num
-    ).first()
+    return _buscar(db, _key_doc(doc_num), PersonaAtendida.numeroDocumento == doc_num)
 
 def get_persona(db: Session, persona_id: int):
     """Busca una persona por ID."""
-    return db.query(PersonaAtendida).filter(
-        PersonaAtendida.id == persona_id
-    ).first()
+    return _buscar(db, _key_id(persona_id), PersonaAtendida.id == persona_id)
+
+def cache_stats() -> dict:
+    """Contadores de la caché de personas (hits, misses, evictions...)."""
+    return get_cache().stats()
 
 def get_personas(db: Session, skip: int = 0, limit: int = 100) -> List[PersonaAtendida]:
     """Lista personas con paginación."""
     return db.query(PersonaAtendida).offset(skip).limit(limit).all()
 
+def encode_cursor(last_id: int) -> str:
+    """Codifica el último ID visto como un cursor opaco."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Decodifica un cursor opaco; lanza ValueError si es inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Cursor inválido") from exc
+    if not isinstance(last_id, int):
+        raise ValueError("Cursor inválido")
+    return last_id
+
+def _columnas(campos: Sequence[str]):
+    return [getattr(PersonaAtendida, campo) for campo in campos]
+
+def _keyset_stmt(ultimo_id: Optional[int], limit: int, campos: Optional[Sequence[str]] = None):
+    """SELECT ... WHERE id > ultimo_id ORDER BY id LIMIT limit (usa la PK, sin OFFSET)."""
+    entidad = _columnas(campos) if campos else [PersonaAtendida]
+    stmt = select(*entidad).order_by(PersonaAtendida.id)
+    if ultimo_id is not None:
+        stmt = stmt.where(PersonaAtendida.id > ultimo_id)
+    return stmt.limit(limit)
+
+def _pagina_stmt(cursor: Optional[str], limit: int, campos: Optional[Sequence[str]] = None):
+    # Se pide una fila extra para saber si hay página siguiente
+    return _keyset_stmt(decode_cursor(cursor) if cursor else None, limit + 1, campos)
+
+def _cortar_pagina(rows: List[PersonaAtendida], limit: int):
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+def get_personas_keyset(
+    db: Session, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[PersonaAtendida], Optional[str]]:
+    """Lista personas paginando por ID (keyset): el costo no crece con la profundidad."""
+    rows = db.execute(_pagina_stmt(cursor, limit)).scalars().all()
+    return _cortar_pagina(rows, limit)
+
+def get_personas_filas(db: Session, campos: Sequence[str], skip: int = 0, limit: int = 100) -> List[Row]:
+    """Como get_personas, pero trae solo `campos` como tuplas (sin armar objetos ORM)."""
+    stmt = select(*_columnas(campos)).order_by(PersonaAtendida.id).offset(skip).limit(limit)
+    return db.execute(stmt).all()
+
+def get_personas_keyset_filas(
+    db: Session, campos: Sequence[str], cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[Row], Optional[str]]:
+    """Como get_personas_keyset, pero con tuplas de `campos` (debe incluir 'id')."""
+    return _cortar_pagina(db.execute(_pagina_stmt(cursor, limit, campos)).all(), limit)
+
+def iter_personas(db: Session, batch_size: int = 1000) -> Iterator[PersonaAtendida]:
+    """Recorre todas las personas en lotes keyset de `batch_size` filas.
+
+    Cada lote es una consulta independiente (WHERE id > último ORDER BY id LIMIT n),
+    así la memoria no depende del tamaño de la tabla aunque el driver bufferice
+    el resultado (mysql.connector no soporta cursores del lado del servidor).
+    """
+    ultimo_id = None
+    while True:
+        lote = db.execute(_keyset_stmt(ultimo_id, batch_size)).scalars().all()
+        if not lote:
+            break
+        ultimo_id = lote[-1].id
+        yield from lote
+        # Suelta los objetos ya entregados del identity map (la sesión debe ser
+        # exclusiva del recorrido, como en la exportación)
+        db.expunge_all()
+        if len(lote) < batch_size:
+            break
+
 def create_persona(db: Session, persona: PersonaCreate) -> PersonaAtendida:
     """Crea un nuevo registro de Persona Atendida."""
     # Nota: Aquí iría lógica de validación compleja, ej: si el paciente es menor 
@@ -27,15 +159,242 @@ def create_persona(db: Session, persona: PersonaCreate) -> PersonaAtendida:
     
     db_persona = PersonaAtendida(**persona.model_dump())
     db.add(db_persona)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Otro proceso insertó el documento tras la verificación (o la caché negativa
+        # estaba vencida respecto de la BD): se descarta la entrada y se propaga
+        db.rollback()
+        get_cache().delete(_key_doc(persona.numeroDocumento))
+        raise
     db.refresh(db_persona)
+    _cachear(db_persona)  # reemplaza la posible entrada negativa del documento
     return db_persona
 
-# Próximas Implementaciones (Ej. PATCH para cambiar estado)
-# def deactivate_persona(db: Session, persona_id: int):
-#     db_persona = get_persona(db, persona_id)
-#     if db_persona:
-#         db_persona.estado = 'inactivo'
-#         db.commit()
-#         db.refresh(db_persona)
-#     return db_persona
\ No newline at end of file
+SEARCH_MAX_LIMIT = 100
+
+# Mayor que cualquier carácter de los textos normalizados: [termino, termino + FIN)
+# es el rango de todos los valores que empiezan con `termino`.
+_FIN_PREFIJO = "\uffff"
+
+def _prefijo(columna, termino: str):
+    """Filtro por prefijo como rango (>= / <): a diferencia de LIKE, usa el índice."""
+    return (columna >= termino) & (columna < termino + _FIN_PREFIJO)
+
+def _search_stmt(
+    nombres: Optional[str] = None,
+    apellidos: Optional[str] = None,
+    documento: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    limit: int = 20,
+):
+    """Arma la consulta de búsqueda; cada filtro es un rango sobre un índice.
+
+    El orden sigue al índice usado, así el LIMIT corta sin ordenar todas las
+    coincidencias; una coincidencia exacta queda primero por ser el valor más
+    corto con ese prefijo.
+    """
+    stmt = select(PersonaAtendida)
+    if apellidos:
+        stmt = stmt.where(_prefijo(PersonaAtendida.apellidosNormalizado, normalizar_texto(apellidos)))
+    if nombres:
+        stmt = stmt.where(_prefijo(PersonaAtendida.nombresNormalizado, normalizar_texto(nombres)))
+    if documento:
+        stmt = stmt.where(_prefijo(PersonaAtendida.numeroDocumento, documento.strip()))
+    if fecha_desde:
+        stmt = stmt.where(PersonaAtendida.fechaNacimiento >= fecha_desde)
+    if fecha_hasta:
+        stmt = stmt.where(PersonaAtendida.fechaNacimiento <= fecha_hasta)
+    if apellidos:
+        orden = [PersonaAtendida.apellidosNormalizado, PersonaAtendida.nombresNormalizado]
+    elif nombres:
+        orden = [PersonaAtendida.nombresNormalizado, PersonaAtendida.apellidosNormalizado]
+    elif documento:
+        orden = [PersonaAtendida.numeroDocumento]
+    else:
+        orden = [PersonaAtendida.fechaNacimiento]
+    return stmt.order_by(*orden, PersonaAtendida.id).limit(min(limit, SEARCH_MAX_LIMIT))
+
+def search_personas(db: Session, limit: int = 20, **filtros) -> List[PersonaAtendida]:
+    """Busca personas por prefijo de nombres/apellidos/documento y rango de nacimiento.
+
+    Filtros: nombres, apellidos, documento, fecha_desde, fecha_hasta.
+    Los nombres se comparan normalizados (sin acentos ni mayúsculas).
+    """
+    return db.execute(_search_stmt(limit=limit, **filtros)).scalars().all()
+
+BULK_CHUNK_SIZE = 500
+
+def _fila(fila: int, persona: PersonaCreate, estado: str, detalle: Optional[str] = None) -> dict:
+    return {"fila": fila, "numeroDocumento": persona.numeroDocumento, "estado": estado, "detalle": detalle}
+
+def _insertar_lote(db: Session, lote: List[Tuple[int, PersonaCreate]]) -> List[dict]:
+    """Inserta un lote ya depurado con un solo executemany y hace commit.
+
+    Si el lote falla (ej. otro proceso insertó el mismo documento entre la
+    verificación y el INSERT) se reintenta fila por fila para aislar la culpable.
+    """
+    try:
+        db.execute(insert(PersonaAtendida), [p.model_dump() for _, p in lote])
+        db.commit()
+    except DBAPIError as exc:
+        db.rollback()
+        if len(lote) == 1:
+            n, p = lote[0]
+            if isinstance(exc, IntegrityError):
+                return [_fila(n, p, "conflicto", "Documento ya registrado")]
+            return [_fila(n, p, "error", str(exc.orig))]
+        resultado = []
+        for item in lote:
+            resultado.extend(_insertar_lote(db, [item]))
+        return resultado
+    _invalidar_nuevas(db, [p.numeroDocumento for _, p in lote])
+    return [_fila(n, p, "creada") for n, p in lote]
+
+def _invalidar_nuevas(db: Session, documentos: List[str]) -> None:
+    """Quita las entradas negativas (por documento y por ID) de personas recién creadas."""
+    cache = get_cache()
+    for doc in documentos:
+        cache.delete(_key_doc(doc))
+    # Los IDs los asigna la BD: un GET /personas/{id} previo a la carga pudo dejarlos en negativo
+    for (persona_id,) in db.execute(
+        select(PersonaAtendida.id).where(PersonaAtendida.numeroDocumento.in_(documentos))
+    ):
+        cache.delete(_key_id(persona_id))
+
+def bulk_create_personas(
+    db: Session,
+    personas: Iterable[PersonaCreate],
+    chunk_size: int = BULK_CHUNK_SIZE,
+    fila_inicial: int = 0,
+) -> List[dict]:
+    """Carga masiva de personas en lotes de `chunk_size`.
+
+    Por cada lote: una sola consulta para detectar documentos existentes,
+    un INSERT multi-fila y un commit (un lote fallido no afecta a los demás).
+    Devuelve un reporte por fila con estado 'creada', 'conflicto' o 'error'
+    (fallo de la BD no debido a un documento duplicado).
+    """
+    reporte = []
+    numeradas = enumerate(personas, start=fila_inicial)
+    while True:
+        chunk = list(islice(numeradas, chunk_size))
+        if not chunk:
+            break
+        documentos = {p.numeroDocumento for _, p in chunk}
+        existentes = {
+            doc for (doc,) in db.query(PersonaAtendida.numeroDocumento).filter(
+                PersonaAtendida.numeroDocumento.in_(documentos)
+            )
+        }
+        lote, vistos = [], set()
+        for n, p in chunk:
+            if p.numeroDocumento in existentes:
+                reporte.append(_fila(n, p, "conflicto", "Documento ya registrado"))
+            elif p.numeroDocumento in vistos:
+                reporte.append(_fila(n, p, "conflicto", "Documento duplicado en la carga"))
+            else:
+                vistos.add(p.numeroDocumento)
+                lote.append((n, p))
+        if lote:
+            reporte.extend(_insertar_lote(db, lote))
+    reporte.sort(key=lambda r: r["fila"])
+    return reporte
+
+def deactivate_persona(db: Session, persona_id: int):
+    """Marca una persona como inactiva y refresca su entrada en caché."""
+    db_persona = get_persona(db, persona_id)
+    if db_persona:
+        db_persona.estado = 'inactivo'
+        db.commit()
+        db.refresh(db_persona)
+        _cachear(db_persona)
+    return db_persona
+
+# ----------------- Variantes asíncronas (AsyncSession) -----------------
+
+# La caché se usa con aget/aset para no bloquear el event loop (ej. con Redis)
+
+async def _cachear_async(persona: PersonaAtendida) -> None:
+    datos = _datos(persona)
+    cache = get_cache()
+    await cache.aset(_key_id(persona.id), datos)
+    await cache.aset(_key_doc(persona.numeroDocumento), datos)
+
+async def _guardar_resultado_async(key: str, persona: Optional[PersonaAtendida]) -> None:
+    if persona is None:
+        await get_cache().aset(key, NEGATIVO, ttl=CACHE_NEGATIVE_TTL)
+    else:
+        await _cachear_async(persona)
+
+async def _buscar_async(db: AsyncSession, key: str, criterio):
+    hit, persona = _desde_cache(*await get_cache().aget(key))
+    if hit:
+        return await db.merge(persona, load=False) if persona is not None else None
+    result = await db.execute(select(PersonaAtendida).where(criterio).limit(1))
+    persona = result.scalars().first()
+    await _guardar_resultado_async(key, persona)
+    return persona
+
+async def get_persona_by_document_async(db: AsyncSession, doc_num: str):
+    """Versión async de get_persona_by_document."""
+    return await _buscar_async(db, _key_doc(doc_num), PersonaAtendida.numeroDocumento == doc_num)
+
+async def get_persona_async(db: AsyncSession, persona_id: int):
+    """Versión async de get_persona."""
+    return await _buscar_async(db, _key_id(persona_id), PersonaAtendida.id == persona_id)
+
+async def get_personas_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[PersonaAtendida]:
+    """Versión async de get_personas."""
+    result = await db.execute(select(PersonaAtendida).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_personas_keyset_async(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[PersonaAtendida], Optional[str]]:
+    """Versión async de get_personas_keyset."""
+    result = await db.execute(_pagina_stmt(cursor, limit))
+    return _cortar_pagina(result.scalars().all(), limit)
+
+async def get_personas_filas_async(
+    db: AsyncSession, campos: Sequence[str], skip: int = 0, limit: int = 100
+) -> List[Row]:
+    """Versión async de get_personas_filas."""
+    stmt = select(*_columnas(campos)).order_by(PersonaAtendida.id).offset(skip).limit(limit)
+    return (await db.execute(stmt)).all()
+
+async def get_personas_keyset_filas_async(
+    db: AsyncSession, campos: Sequence[str], cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[Row], Optional[str]]:
+    """Versión async de get_personas_keyset_filas."""
+    return _cortar_pagina((await db.execute(_pagina_stmt(cursor, limit, campos))).all(), limit)
+
+async def search_personas_async(db: AsyncSession, limit: int = 20, **filtros) -> List[PersonaAtendida]:
+    """Versión async de search_personas."""
+    result = await db.execute(_search_stmt(limit=limit, **filtros))
+    return result.scalars().all()
+
+async def create_persona_async(db: AsyncSession, persona: PersonaCreate) -> PersonaAtendida:
+    """Versión async de create_persona."""
+    db_persona = PersonaAtendida(**persona.model_dump())
+    db.add(db_persona)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        await get_cache().adelete(_key_doc(persona.numeroDocumento))
+        raise
+    await db.refresh(db_persona)
+    await _cachear_async(db_persona)
+    return db_persona
+
+async def deactivate_persona_async(db: AsyncSession, persona_id: int):
+    """Versión async de deactivate_persona."""
+    db_persona = await get_persona_async(db, persona_id)
+    if db_persona:
+        db_persona.estado = 'inactivo'
+        await db.commit()
+        await db.refresh(db_persona)
+        await _cachear_async(db_persona)
+    return db_persona
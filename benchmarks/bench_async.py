@@ -0,0 +1,114 @@
+"""Prueba de carga: handlers síncronos (threadpool) vs. asíncronos (asyncio).
+
+Uso:
+    python -m benchmarks.bench_async --clientes 64 --peticiones 5000
+
+Levanta dos apps FastAPI equivalentes (una con `def` + Session, otra con
+`async def` + AsyncSession) y las ataca con clientes concurrentes, reportando
+peticiones/segundo y latencias p50/p99 por modo. Por defecto usa un archivo
+SQLite (aiosqlite); con --db-url/--async-db-url se apunta a MySQL.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.services import persona_service
+from app.services.cache import MemoryCache, set_cache
+from benchmarks.datos import preparar_base
+
+def crear_app_sync(db_url: str) -> FastAPI:
+    SessionLocal = sessionmaker(bind=create_engine(db_url))
+    app = FastAPI()
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/personas/{persona_id}")
+    def consulta(persona_id: int, db=Depends(get_db)):
+        persona = persona_service.get_persona(db, persona_id)
+        if persona is None:
+            raise HTTPException(status_code=404)
+        return {"id": persona.id}
+
+    return app
+
+def crear_app_async(async_db_url: str) -> FastAPI:
+    AsyncSessionLocal = async_sessionmaker(create_async_engine(async_db_url), expire_on_commit=False)
+    app = FastAPI()
+
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    @app.get("/personas/{persona_id}")
+    async def consulta(persona_id: int, db=Depends(get_db)):
+        persona = await persona_service.get_persona_async(db, persona_id)
+        if persona is None:
+            raise HTTPException(status_code=404)
+        return {"id": persona.id}
+
+    return app
+
+async def atacar(app: FastAPI, clientes: int, peticiones: int, max_id: int):
+    """Lanza `peticiones` GET repartidas entre `clientes` concurrentes."""
+    latencias = []
+    pendientes = iter(range(peticiones))
+    rnd = random.Random(7)
+    transport = httpx.ASGITransport(app=app)
+
+    async def cliente(http):
+        for _ in pendientes:
+            t0 = time.perf_counter()
+            r = await http.get(f"/personas/{rnd.randint(1, max_id)}")
+            latencias.append(time.perf_counter() - t0)
+            r.raise_for_status()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(cliente(http) for _ in range(clientes)))
+        total = time.perf_counter() - t0
+
+    latencias.sort()
+    return {
+        "rps": peticiones / total,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p99_ms": latencias[int(len(latencias) * 0.99) - 1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite:////tmp/bench_async.db")
+    parser.add_argument("--async-db-url", default="sqlite+aiosqlite:////tmp/bench_async.db")
+    parser.add_argument("--filas", type=int, default=10000)
+    parser.add_argument("--clientes", type=int, default=64)
+    parser.add_argument("--peticiones", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Sin caché, para medir el acceso real a la base de datos
+    set_cache(MemoryCache(max_size=0))
+
+    preparar_base(args.db_url, args.filas)
+
+    print(f"clientes={args.clientes} peticiones={args.peticiones}")
+    print(f"{'modo':>6} {'req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for modo, app in (
+        ("sync", crear_app_sync(args.db_url)),
+        ("async", crear_app_async(args.async_db_url)),
+    ):
+        r = asyncio.run(atacar(app, args.clientes, args.peticiones, args.filas))
+        print(f"{modo:>6} {r['rps']:>10.1f} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
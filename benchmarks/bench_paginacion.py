@@ -0,0 +1,55 @@
+"""Benchmark: paginación por OFFSET vs. keyset (cursor) a distintas profundidades.
+
+Uso:
+    python -m benchmarks.bench_paginacion --filas 200000 --limit 100
+
+Por defecto usa SQLite en memoria; con --db-url se puede apuntar a MySQL.
+"""
+import argparse
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.persona import PersonaAtendida
+from app.services import persona_service
+from benchmarks.datos import preparar_base
+
+def medir(fn, repeticiones: int) -> float:
+    """Devuelve la mediana en milisegundos de `repeticiones` ejecuciones."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite://")
+    parser.add_argument("--filas", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = preparar_base(args.db_url, args.filas)
+    session = sessionmaker(bind=engine)()
+
+    ids = [row[0] for row in session.query(PersonaAtendida.id).order_by(PersonaAtendida.id)]
+    print(f"{'profundidad':>12} {'offset (ms)':>12} {'keyset (ms)':>12}")
+    for fraccion in (0, 0.1, 0.25, 0.5, 0.75, 0.99):
+        skip = int((len(ids) - args.limit) * fraccion)
+        cursor = persona_service.encode_cursor(ids[skip - 1]) if skip else None
+        t_offset = medir(
+            lambda: persona_service.get_personas(session, skip=skip, limit=args.limit),
+            args.repeticiones,
+        )
+        t_keyset = medir(
+            lambda: persona_service.get_personas_keyset(session, cursor=cursor, limit=args.limit),
+            args.repeticiones,
+        )
+        session.expunge_all()
+        print(f"{skip:>12} {t_offset:>12.2f} {t_keyset:>12.2f}")
+
+if __name__ == "__main__":
+    main()
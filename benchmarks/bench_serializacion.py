@@ -0,0 +1,72 @@
+"""Microbenchmark: costo de codificar una página de personas, por fila.
+
+Uso:
+    python -m benchmarks.bench_serializacion --filas 100 --repeticiones 2000
+
+Compara, sin base de datos:
+- pydantic: objeto ORM -> PersonaResponse.model_validate -> JSON (camino por defecto de FastAPI)
+- tuplas + json: tuplas de columnas -> dict -> json.dumps
+- tuplas + orjson: tuplas de columnas -> dict -> orjson (camino rápido de app.responses)
+- etag: solo el cálculo del ETag (lo que cuesta un 304)
+"""
+import argparse
+import datetime
+import json
+import time
+
+from app.models.persona import PersonaAtendida
+from app.schemas.persona import PersonaResponse
+from app import responses
+
+CAMPOS = responses.campos_de(PersonaResponse)
+
+def generar(filas: int):
+    personas = [
+        PersonaAtendida(
+            id=n, tipoDocumento="CI", numeroDocumento=f"V{n:08d}", nombres=f"Nombre {n}",
+            apellidos=f"Apellido {n}", fechaNacimiento=datetime.date(1990, 1, 1) + datetime.timedelta(days=n),
+            sexo="F", estado="activo",
+        )
+        for n in range(filas)
+    ]
+    tuplas = [tuple(getattr(p, c) for c in CAMPOS) for p in personas]
+    return personas, tuplas
+
+def por_pydantic(personas):
+    return json.dumps(
+        [PersonaResponse.model_validate(p).model_dump(mode="json") for p in personas]
+    ).encode()
+
+def por_tuplas_json(tuplas):
+    return json.dumps(responses.filas_a_dicts(tuplas, CAMPOS), default=responses._default).encode()
+
+def por_tuplas_rapido(tuplas):
+    return responses.dumps(responses.filas_a_dicts(tuplas, CAMPOS))
+
+def medir(fn, arg, repeticiones: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        fn(arg)
+    return (time.perf_counter() - t0) / repeticiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    personas, tuplas = generar(args.filas)
+    casos = [
+        ("pydantic", por_pydantic, personas),
+        ("tuplas + json", por_tuplas_json, tuplas),
+        (f"tuplas + {'orjson' if responses.orjson else 'json (sin orjson)'}", por_tuplas_rapido, tuplas),
+        ("etag (304)", responses.calcular_etag, tuplas),
+    ]
+    print(f"{args.filas} filas por página")
+    print(f"{'camino':<28} {'µs/página':>12} {'µs/fila':>10}")
+    for nombre, fn, datos in casos:
+        segundos = medir(fn, datos, args.repeticiones)
+        print(f"{nombre:<28} {segundos * 1e6:>12.1f} {segundos * 1e6 / args.filas:>10.3f}")
+
+if __name__ == "__main__":
+    main()
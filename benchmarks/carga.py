@@ -0,0 +1,272 @@
+"""Harness de carga reproducible para la API (routers de `app` y `src.main`).
+
+Uso:
+    # 1. Línea base
+    python -m benchmarks.carga --escala 100000 --salida base.json
+    # 2. Tras un cambio: compara y falla (exit 1) si empeora más de un 10 %
+    python -m benchmarks.carga --escala 100000 --salida nuevo.json --comparar base.json --umbral 0.10
+
+Pasos:
+1. Genera los datos sintéticos (benchmarks.datos) en SQLite o MySQL (--db-url).
+2. Ataca cada escenario (endpoint) con --clientes concurrentes en proceso
+   (httpx + ASGI), tras un calentamiento.
+3. Reporta req/s, latencias p50/p95/p99, errores y pico de memoria (tracemalloc,
+   en una pasada aparte para no distorsionar las latencias).
+4. Guarda un JSON comparable entre corridas y, con --comparar, marca regresiones.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Métricas comparadas: (nombre, True si "más alto es peor")
+METRICAS_COMPARADAS = (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("rps", False))
+
+def percentil(valores_ordenados, p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, int(round(p / 100 * len(valores_ordenados))) - 1))
+    return valores_ordenados[indice]
+
+# ----------------- Escenarios -----------------
+
+def _escenarios(escala: int, es_sqlite: bool):
+    """(nombre, app, generador de rutas, solo_mysql). Cada generador recibe un Random."""
+    from app.services import persona_service
+    from benchmarks.datos import APELLIDOS
+
+    escenarios = [
+        ("GET /health", "src", lambda rnd: "/health", False),
+        ("GET /personas/{id}", "app",
+         lambda rnd: f"/personas/{rnd.randint(1, escala)}", False),
+        ("GET /personas/ (offset)", "app",
+         lambda rnd: f"/personas/?skip={rnd.randint(0, max(0, escala - 100))}&limit=100", False),
+        ("GET /personas/keyset", "app",
+         lambda rnd: f"/personas/keyset?limit=100&cursor={persona_service.encode_cursor(rnd.randint(0, max(0, escala - 100)))}",
+         False),
+        ("GET /personas/search", "app",
+         lambda rnd: f"/personas/search?apellidos={rnd.choice(APELLIDOS)[:3]}&limit=20", False),
+        # operaciones.py usa SQL con marcadores %s de MySQL
+        ("GET /profesionales/", "src", lambda rnd: "/profesionales/?limite=100", True),
+    ]
+    return [e for e in escenarios if not (e[3] and es_sqlite)]
+
+def configurar_entorno(db_url: str):
+    """Apunta app.database / conexion.py a la base de benchmark (antes de importarlos)."""
+    from sqlalchemy.engine import make_url
+
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite":
+        ruta = url.database
+        os.environ["DB_URL"] = "sqlite://"
+        os.environ["ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{ruta}"
+        import sqlite3
+        import conexion
+        conexion.configurar_pool(creador=lambda: sqlite3.connect(ruta, check_same_thread=False))
+        return True
+    os.environ.update({
+        "DB_URL": "mysql+mysqlconnector://",
+        "ASYNC_DB_URL": url.set(drivername="mysql+aiomysql").render_as_string(hide_password=False),
+        "DB_HOST": url.host or "127.0.0.1",
+        "DB_USER": url.username or "",
+        "DB_PASSWORD": url.password or "",
+        "DB_NAME": url.database or "",
+    })
+    return False
+
+def configurar_url_sync(db_url: str) -> str:
+    """URL con el driver de conexion.py (mysql.connector) para cargar los datos."""
+    from sqlalchemy.engine import make_url
+    return make_url(db_url).set(drivername="mysql+mysqlconnector").render_as_string(hide_password=False)
+
+def crear_apps():
+    from fastapi import FastAPI
+    from app.services.app.routers import personas
+    from src.main import app as app_src
+
+    # El router de app/ no está montado en ninguna app: se monta aquí
+    app_personas = FastAPI()
+    app_personas.include_router(personas.router)
+    return {"app": app_personas, "src": app_src}
+
+# ----------------- Ejecución -----------------
+
+async def _lanzar(http, rutas, clientes: int, peticiones: int):
+    """Reparte `peticiones` entre `clientes` concurrentes; devuelve (latencias, errores, duración)."""
+    latencias, errores = [], 0
+    pendientes = iter(range(peticiones))
+
+    async def cliente():
+        nonlocal errores
+        for _ in pendientes:
+            ruta = rutas()
+            t0 = time.perf_counter()
+            respuesta = await http.get(ruta)
+            await respuesta.aread()
+            latencias.append(time.perf_counter() - t0)
+            if respuesta.status_code >= 400 and respuesta.status_code != 404:
+                errores += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    return latencias, errores, time.perf_counter() - t0
+
+async def medir_escenario(app, generador, args):
+    import httpx
+
+    rnd = random.Random(args.semilla)
+    rutas = lambda: generador(rnd)
+    # Sin raise_app_exceptions, una excepción no manejada cuenta como 500 (errores)
+    # en lugar de abortar toda la corrida
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await _lanzar(http, rutas, args.clientes, args.calentamiento)
+        latencias, errores, duracion = await _lanzar(http, rutas, args.clientes, args.peticiones)
+
+        # Pasada aparte para memoria: tracemalloc enlentece las peticiones
+        tracemalloc.start()
+        await _lanzar(http, rutas, args.clientes, min(args.peticiones, args.peticiones_memoria))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencias.sort()
+    return {
+        "peticiones": len(latencias),
+        "errores": errores,
+        "rps": round(len(latencias) / duracion, 2),
+        "p50_ms": round(percentil(latencias, 50) * 1000, 3),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 3),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 3),
+        "memoria_pico_kb": round(pico / 1024, 1),
+    }
+
+async def ejecutar(args, es_sqlite: bool):
+    apps = crear_apps()
+    resultados = {}
+    for nombre, app, generador, _ in _escenarios(args.escala, es_sqlite):
+        if args.solo and not any(filtro in nombre for filtro in args.solo):
+            continue
+        resultados[nombre] = await medir_escenario(apps[app], generador, args)
+        r = resultados[nombre]
+        print(f"{nombre:<28} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['memoria_pico_kb']:>10.1f} {r['errores']:>7}")
+    return resultados
+
+# ----------------- Comparación -----------------
+
+def comparar(actual: dict, base: dict, umbral: float):
+    """Compara dos corridas; devuelve la lista de regresiones (escenario, métrica, base, actual, cambio).
+
+    Los escenarios ausentes en la corrida actual se reportan con métrica "ausente" y valores None.
+    """
+    regresiones = []
+    # Un escenario de la base que ya no se midió (ej. la app no arranca) también es regresión
+    for escenario in base["resultados"].keys() - actual["resultados"].keys():
+        regresiones.append((escenario, "ausente", None, None, None))
+    for escenario, metricas in actual["resultados"].items():
+        previas = base["resultados"].get(escenario)
+        if not previas:
+            continue
+        for metrica, mas_alto_es_peor in METRICAS_COMPARADAS:
+            antes, ahora = previas.get(metrica), metricas.get(metrica)
+            if not antes or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes
+            if (cambio > umbral) if mas_alto_es_peor else (cambio < -umbral):
+                regresiones.append((escenario, metrica, antes, ahora, cambio))
+        # Cualquier error nuevo es una regresión, sin umbral (la base suele tener 0)
+        antes, ahora = previas.get("errores", 0), metricas.get("errores", 0)
+        if ahora > antes:
+            cambio = (ahora - antes) / antes if antes else float("inf")
+            regresiones.append((escenario, "errores", antes, ahora, cambio))
+    return regresiones
+
+def _metadatos(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "fecha": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "db": args.db_url.split("@")[-1],  # sin credenciales
+        "escala": args.escala,
+        "profesionales": args.profesionales,
+        "clientes": args.clientes,
+        "peticiones": args.peticiones,
+        "cache": args.cache,
+        "semilla": args.semilla,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite:////tmp/bench_carga.db")
+    parser.add_argument("--escala", type=int, default=10000, help="PersonasAtendidas (10k a 1M)")
+    parser.add_argument("--profesionales", type=int, default=None, help="por defecto escala / 10")
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--peticiones", type=int, default=2000, help="por escenario")
+    parser.add_argument("--calentamiento", type=int, default=100)
+    parser.add_argument("--peticiones-memoria", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=7)
+    parser.add_argument("--cache", action="store_true", help="mantener la caché de personas activa")
+    parser.add_argument("--solo", action="append", help="filtra escenarios por subcadena (repetible)")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior (línea base)")
+    parser.add_argument("--umbral", type=float, default=0.10, help="regresión tolerada (0.10 = 10 %%)")
+    args = parser.parse_args(argv)
+    if args.profesionales is None:
+        args.profesionales = max(1, args.escala // 10)
+
+    es_sqlite = configurar_entorno(args.db_url)
+    from benchmarks.datos import preparar_base
+    from app.services.cache import MemoryCache, set_cache
+
+    t0 = time.perf_counter()
+    datos_url = args.db_url if es_sqlite else configurar_url_sync(args.db_url)
+    preparar_base(datos_url, args.escala, args.profesionales).dispose()
+    print(f"Datos: {args.escala} personas, {args.profesionales} profesionales "
+          f"({time.perf_counter() - t0:.1f} s)")
+    if not args.cache:
+        set_cache(MemoryCache(max_size=0))  # medir el acceso real a la BD
+
+    print(f"{'escenario':<28} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mem KB':>10} {'errores':>7}")
+    resultado = {"meta": _metadatos(args), "resultados": asyncio.run(ejecutar(args, es_sqlite))}
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        if args.solo:  # solo se comparan los escenarios pedidos
+            base["resultados"] = {
+                nombre: r for nombre, r in base["resultados"].items()
+                if any(filtro in nombre for filtro in args.solo)
+            }
+        regresiones = comparar(resultado, base, args.umbral)
+        for escenario, metrica, antes, ahora, cambio in regresiones:
+            if cambio is None:
+                print(f"❌ {escenario}: está en la línea base pero no se midió en esta corrida")
+            else:
+                print(f"❌ {escenario} {metrica}: {antes} -> {ahora} ({cambio:+.1%})")
+        if regresiones:
+            return 1
+        print(f"✅ Sin regresiones mayores a {args.umbral:.0%} respecto de {args.comparar}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
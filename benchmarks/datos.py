@@ -0,0 +1,99 @@
+"""Generación de datos sintéticos de gestion_salud (PersonasAtendidas y Profesionales).
+
+Uso:
+    python -m benchmarks.datos --db-url sqlite:////tmp/bench.db --personas 100000 --profesionales 10000
+
+Los datos son deterministas (semilla fija): la misma escala produce las
+mismas filas, así los resultados entre corridas son comparables.
+"""
+import argparse
+import datetime
+import random
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, insert, select
+
+from app.models.base import Base
+from app.models.persona import PersonaAtendida
+
+SEMILLA = 42
+
+NOMBRES = ["José", "María", "Ángel", "Lucía", "Andrés", "Sofía", "Raúl", "Inés",
+           "Jesús", "Mónica", "Óscar", "Verónica", "Iván", "Beatriz", "Tomás", "Begoña"]
+APELLIDOS = ["Pérez", "Gómez", "Rodríguez", "Martínez", "Hernández", "López", "Díaz",
+             "Sánchez", "Ramírez", "Cordero", "Rincón", "Núñez", "Suárez", "Álvarez",
+             "Peña", "Ibáñez", "Muñoz", "Chacón", "Briceño", "Zambrano"]
+
+# Profesionales no tiene modelo ORM (se usa desde operaciones.py con SQL directo)
+metadata_profesionales = MetaData()
+profesionales = Table(
+    "Profesionales", metadata_profesionales,
+    Column("id", Integer, primary_key=True),
+    Column("nombres", String(100), nullable=False),
+    Column("apellidos", String(100), nullable=False),
+    Column("registroProfesional", String(30), nullable=False, unique=True),
+)
+
+def personas_sinteticas(filas: int, inicio: int = 0, semilla: int = SEMILLA):
+    """Genera diccionarios de PersonasAtendidas; la fila n siempre es la misma."""
+    nacimiento_base = datetime.date(1930, 1, 1)
+    for n in range(inicio, inicio + filas):
+        rnd = random.Random(semilla * 1_000_003 + n)
+        yield {
+            "tipoDocumento": rnd.choice(["CI", "CI", "CI", "PAS"]),
+            "numeroDocumento": f"{rnd.randint(1, 35_000_000):08d}-{n}",
+            "nombres": f"{rnd.choice(NOMBRES)} {rnd.choice(NOMBRES)}",
+            "apellidos": f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+            "fechaNacimiento": nacimiento_base + datetime.timedelta(days=rnd.randint(0, 34000)),
+            "sexo": rnd.choice(["M", "F", "Otro"]),
+            "estado": "activo" if rnd.random() < 0.95 else "inactivo",
+        }
+
+def profesionales_sinteticos(filas: int, inicio: int = 0, semilla: int = SEMILLA):
+    for n in range(inicio, inicio + filas):
+        rnd = random.Random(semilla * 2_000_003 + n)
+        yield {
+            "nombres": rnd.choice(NOMBRES),
+            "apellidos": f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+            "registroProfesional": f"MPPS-{n:07d}",
+        }
+
+def _poblar(conn, tabla, generador, total: int, lote: int):
+    """Completa `tabla` hasta `total` filas (reanuda si ya tiene algunas)."""
+    existentes = conn.execute(select(func.count()).select_from(tabla)).scalar()
+    for inicio in range(existentes, total, lote):
+        conn.execute(insert(tabla), list(generador(min(lote, total - inicio), inicio)))
+        conn.commit()
+    return max(0, total - existentes)
+
+def poblar_personas(conn, total: int, lote: int = 10000) -> int:
+    """Asegura `total` PersonasAtendidas sintéticas; devuelve cuántas insertó."""
+    return _poblar(conn, PersonaAtendida.__table__, personas_sinteticas, total, lote)
+
+def poblar_profesionales(conn, total: int, lote: int = 10000) -> int:
+    return _poblar(conn, profesionales, profesionales_sinteticos, total, lote)
+
+def preparar_base(db_url: str, personas: int, profesionales_total: int = 0):
+    """Crea las tablas y carga los datos; devuelve el engine."""
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    metadata_profesionales.create_all(engine)
+    with engine.connect() as conn:
+        poblar_personas(conn, personas)
+        if profesionales_total:
+            poblar_profesionales(conn, profesionales_total)
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite:////tmp/bench.db")
+    parser.add_argument("--personas", type=int, default=10000)
+    parser.add_argument("--profesionales", type=int, default=1000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    preparar_base(args.db_url, args.personas, args.profesionales)
+    print(f"✅ Datos listos en {time.perf_counter() - t0:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,261 @@
-import mysql.connector
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Parámetros de conexión (se pueden sobreescribir con variables de entorno)
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', '127.0.0.1'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', '123456'),
+    'database': os.getenv('DB_NAME', 'gestion_salud'),
+}
+
+# Parámetros del pool
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+
+class PoolTimeoutError(Exception):
+    """No se pudo obtener una conexión del pool dentro del tiempo de espera."""
+
+
+def _crear_conexion_mysql():
+    import mysql.connector
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def _ping(conexion):
+    """Verifica que la conexión siga viva ejecutando un SELECT 1."""
+    cursor = conexion.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class ConexionPool:
+    """Envoltorio de una conexión del pool: close() la devuelve en vez de cerrarla."""
+
+    __slots__ = ('_pool', '_conexion')
+
+    def __init__(self, pool, conexion):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conexion', conexion)
+
+    def close(self):
+        conexion = self._conexion
+        if conexion is not None:
+            object.__setattr__(self, '_conexion', None)
+            self._pool.liberar(conexion)
+
+    def descartar(self):
+        """Cierra la conexión real y libera su hueco en vez de devolverla al pool."""
+        conexion = self._conexion
+        if conexion is not None:
+            object.__setattr__(self, '_conexion', None)
+            self._pool._descartar(conexion, 'descartadas')
+
+    def __getattr__(self, nombre):
+        if self._conexion is None:
+            raise RuntimeError("La conexión ya fue devuelta al pool")
+        return getattr(self._conexion, nombre)
+
+    def __setattr__(self, nombre, valor):
+        if self._conexion is None:
+            raise RuntimeError("La conexión ya fue devuelta al pool")
+        setattr(self._conexion, nombre, valor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PoolConexiones:
+    """Pool acotado de conexiones reutilizables.
+
+    - `tamano`: máximo de conexiones abiertas a la vez.
+    - `timeout`: segundos que se espera por una conexión libre.
+    - `reciclar`: segundos de inactividad tras los cuales se reabre la conexión.
+    - `ping`: función de verificación al entregar una conexión (None = sin verificar).
+    """
+
+    def __init__(self, creador=_crear_conexion_mysql, tamano=POOL_SIZE,
+                 timeout=POOL_TIMEOUT, reciclar=POOL_RECYCLE, ping=_ping):
+        if tamano < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+        self._creador = creador
+        self.tamano = tamano
+        self.timeout = timeout
+        self.reciclar = reciclar
+        self._ping = ping
+        self._libres = []  # pila de (conexion, ultimo_uso)
+        self._abiertas = 0
+        self._cerrado = False
+        self._cond = threading.Condition()
+        self._metricas = {
+            'checkouts': 0,
+            'esperas': 0,
+            'timeouts': 0,
+            'creadas': 0,
+            'recicladas': 0,
+            'descartadas': 0,
+        }
+
+    def _cerrar_silencioso(self, conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def _tomar(self):
+        """Reserva un hueco del pool; devuelve una conexión libre o None si hay que crearla."""
+        limite = time.monotonic() + self.timeout
+        with self._cond:
+            espero = False
+            while not self._libres and self._abiertas >= self.tamano:
+                if not espero:
+                    self._metricas['esperas'] += 1
+                    espero = True
+                restante = limite - time.monotonic()
+                if restante <= 0 or not self._cond.wait(restante):
+                    if not self._libres and self._abiertas >= self.tamano:
+                        self._metricas['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Sin conexiones libres tras {self.timeout}s (tamaño={self.tamano})"
+                        )
+            if self._libres:
+                return self._libres.pop()
+            self._abiertas += 1
+            return None
+
+    def _descartar(self, conexion, metrica):
+        self._cerrar_silencioso(conexion)
+        with self._cond:
+            self._abiertas -= 1
+            self._metricas[metrica] += 1
+            self._cond.notify()
+
+    def obtener(self):
+        """Entrega una conexión sana del pool (o una nueva si hay espacio)."""
+        libre = self._tomar()
+        if libre is not None:
+            conexion, ultimo_uso = libre
+            if self.reciclar is not None and time.monotonic() - ultimo_uso > self.reciclar:
+                self._cerrar_en_hueco(conexion, 'recicladas')
+            elif not self._sana(conexion):
+                self._cerrar_en_hueco(conexion, 'descartadas')
+            else:
+                return self._entregar(conexion)
+        # El hueco ya está reservado por _tomar (o conservado por _cerrar_en_hueco)
+        return self._abrir()
+
+    def _sana(self, conexion):
+        if self._ping is None:
+            return True
+        try:
+            self._ping(conexion)
+        except Exception:
+            return False
+        return True
+
+    def _cerrar_en_hueco(self, conexion, metrica):
+        """Cierra una conexión vencida o caída conservando su hueco para el reemplazo."""
+        self._cerrar_silencioso(conexion)
+        with self._cond:
+            self._metricas[metrica] += 1
+
+    def _abrir(self):
+        try:
+            conexion = self._creador()
+        except Exception:
+            with self._cond:
+                self._abiertas -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._metricas['creadas'] += 1
+        return self._entregar(conexion)
+
+    def _entregar(self, conexion):
+        # Se cuenta al entregar: los intentos fallidos de conexión no son checkouts
+        with self._cond:
+            self._metricas['checkouts'] += 1
+        return ConexionPool(self, conexion)
+
+    def liberar(self, conexion):
+        """Devuelve una conexión al pool, deshaciendo cualquier transacción pendiente."""
+        try:
+            conexion.rollback()
+        except Exception:
+            self._descartar(conexion, 'descartadas')
+            return
+        with self._cond:
+            if not self._cerrado:
+                self._libres.append((conexion, time.monotonic()))
+                self._cond.notify()
+                return
+        # Pool cerrado (ej. reemplazado con configurar_pool) mientras estaba en uso
+        self._descartar(conexion, 'descartadas')
+
+    def cerrar(self):
+        """Cierra las conexiones libres; las que están en uso se cierran al devolverlas."""
+        with self._cond:
+            self._cerrado = True
+            libres, self._libres = self._libres, []
+            self._abiertas -= len(libres)
+            self._cond.notify_all()
+        for conexion, _ in libres:
+            self._cerrar_silencioso(conexion)
+
+    def metricas(self):
+        """Contadores del pool más el estado actual (en uso / libres)."""
+        with self._cond:
+            datos = dict(self._metricas)
+            datos['libres'] = len(self._libres)
+            datos['en_uso'] = self._abiertas - len(self._libres)
+            datos['tamano'] = self.tamano
+        return datos
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Devuelve el pool compartido del proceso, creándolo la primera vez."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexiones()
+    return _pool
+
+
+def configurar_pool(**kwargs):
+    """Reemplaza el pool compartido (ej. para usar SQLite en pruebas)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+        _pool = PoolConexiones(**kwargs)
+    return _pool
+
 
 def conectar():
-    conexion = mysql.connector.connect(
-        host='127.0.0.1',
-        user='root',
-        password='123456',
-        database='gestion_salud'
-    )
-    return conexion
+    """Obtiene una conexión del pool; al llamar a close() vuelve al pool."""
+    return get_pool().obtener()
+
+
+@contextmanager
+def conexion_db():
+    """Context manager que entrega una conexión del pool y la devuelve al salir."""
+    conexion = conectar()
+    try:
+        yield conexion
+    finally:
+        conexion.close()
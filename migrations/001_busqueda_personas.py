@@ -0,0 +1,61 @@
+"""Agrega columnas normalizadas e índices de búsqueda a PersonasAtendidas.
+
+Uso:
+    python -m migrations.001_busqueda_personas
+
+1. Crea nombresNormalizado / apellidosNormalizado y los índices compuestos
+   usados por GET /personas/search (más el índice de fechaNacimiento).
+2. Rellena las columnas nuevas en lotes, recorriendo la tabla por ID.
+"""
+from sqlalchemy import bindparam, select, text, update
+
+from app.database import engine
+from app.models.persona import PersonaAtendida, normalizar_texto
+
+DDL = [
+    "ALTER TABLE PersonasAtendidas"
+    " ADD COLUMN nombresNormalizado VARCHAR(100) NOT NULL DEFAULT '',"
+    " ADD COLUMN apellidosNormalizado VARCHAR(100) NOT NULL DEFAULT ''",
+    "CREATE INDEX ix_personas_busqueda_apellidos"
+    " ON PersonasAtendidas (apellidosNormalizado, nombresNormalizado)",
+    "CREATE INDEX ix_personas_busqueda_nombres"
+    " ON PersonasAtendidas (nombresNormalizado, apellidosNormalizado)",
+    "CREATE INDEX ix_PersonasAtendidas_fechaNacimiento"
+    " ON PersonasAtendidas (fechaNacimiento)",
+]
+
+LOTE = 5000
+
+def upgrade(conn):
+    for sentencia in DDL:
+        conn.execute(text(sentencia))
+
+    tabla = PersonaAtendida.__table__
+    actualizar = (
+        update(tabla)
+        .where(tabla.c.id == bindparam("_id"))
+        .values(
+            nombresNormalizado=bindparam("_nombres"),
+            apellidosNormalizado=bindparam("_apellidos"),
+        )
+    )
+    ultimo_id = 0
+    while True:
+        filas = conn.execute(
+            select(tabla.c.id, tabla.c.nombres, tabla.c.apellidos)
+            .where(tabla.c.id > ultimo_id)
+            .order_by(tabla.c.id)
+            .limit(LOTE)
+        ).all()
+        if not filas:
+            break
+        conn.execute(actualizar, [
+            {"_id": f.id, "_nombres": normalizar_texto(f.nombres), "_apellidos": normalizar_texto(f.apellidos)}
+            for f in filas
+        ])
+        ultimo_id = filas[-1].id
+
+if __name__ == "__main__":
+    with engine.begin() as conn:
+        upgrade(conn)
+    print("✅ Migración 001_busqueda_personas aplicada")
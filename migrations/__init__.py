@@ -0,0 +1 @@
+# Migraciones de esquema (se ejecutan en orden: python -m migrations.<nombre>)
@@ -1,21 +1,109 @@
-from conexion import conectar
+from itertools import islice
+
+from conexion import conectar, conexion_db
+
+# Columnas que se pueden pedir en las consultas (lista blanca para la proyección)
+COLUMNAS_PROFESIONALES = ("id", "nombres", "apellidos", "registroProfesional")
+LOTE = 500
+
+def _cursor_sin_buffer(conexion):
+    # mysql.connector: cursor no bufferizado, las filas se leen del servidor a medida
+    try:
+        return conexion.cursor(buffered=False)
+    except TypeError:
+        return conexion.cursor()
+
+def _prefijo(texto):
+    """Patrón LIKE de prefijo con los comodines del texto escapados."""
+    return texto.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_") + "%"
+
+def iterar_profesionales(columnas=("id", "nombres", "apellidos"), nombres=None,
+                         apellidos=None, registro=None, desde_id=None, limite=None, lote=LOTE):
+    """Genera los profesionales como diccionarios, leyendo en lotes de `lote` filas.
+
+    - `columnas`: proyección (subconjunto de COLUMNAS_PROFESIONALES).
+    - `nombres` / `apellidos`: filtro por prefijo.
+    - `registro`: registro profesional exacto.
+    - `desde_id`: solo profesionales con id mayor (para reanudar un recorrido).
+    """
+    invalidas = set(columnas) - set(COLUMNAS_PROFESIONALES)
+    if not columnas or invalidas:
+        raise ValueError(f"Columnas inválidas: {sorted(invalidas) or 'ninguna indicada'}")
+
+    condiciones, parametros = [], []
+    if nombres:
+        condiciones.append("nombres LIKE %s")
+        parametros.append(_prefijo(nombres))
+    if apellidos:
+        condiciones.append("apellidos LIKE %s")
+        parametros.append(_prefijo(apellidos))
+    if registro:
+        condiciones.append("registroProfesional = %s")
+        parametros.append(registro)
+    if desde_id is not None:
+        condiciones.append("id > %s")
+        parametros.append(desde_id)
+
+    sql = f"SELECT {', '.join(columnas)} FROM Profesionales"
+    if condiciones:
+        sql += " WHERE " + " AND ".join(condiciones)
+    sql += " ORDER BY id"
+    if limite is not None:
+        sql += " LIMIT %s"
+        parametros.append(int(limite))
 
-def consultar_profesionales():
     conexion = conectar()
-    cursor = conexion.cursor()
-    cursor.execute("SELECT id, nombres, apellidos FROM Profesionales")
-    resultados = cursor.fetchall()
-    for fila in resultados:
-        print(fila)
-    cursor.close()
-    conexion.close()
+    agotado = False
+    try:
+        cursor = _cursor_sin_buffer(conexion)
+        cursor.execute(sql, tuple(parametros))
+        while True:
+            filas = cursor.fetchmany(lote)
+            if not filas:
+                agotado = True
+                break
+            for fila in filas:
+                yield dict(zip(columnas, fila))
+        cursor.close()
+    finally:
+        if agotado:
+            conexion.close()
+        else:
+            # Salida anticipada (break, islice, cliente desconectado) o error: el
+            # cursor sin buffer deja filas sin leer y tanto cursor.close() como el
+            # rollback del pool fallarían ("Unread result found"). Se descarta la
+            # conexión en vez de leer el resto del resultado.
+            conexion.descartar()
+
+def consultar_profesionales():
+    for profesional in iterar_profesionales():
+        print(tuple(profesional.values()))
 
 def insertar_profesional(nombres, apellidos, registro):
-    conexion = conectar()
-    cursor = conexion.cursor()
-    sql = "INSERT INTO Profesionales (nombres, apellidos, registroProfesional) VALUES (%s, %s, %s)"
-    cursor.execute(sql, (nombres, apellidos, registro))
-    conexion.commit()
+    insertar_profesionales([(nombres, apellidos, registro)])
     print("✅ Profesional insertado correctamente")
-    cursor.close()
-    conexion.close()
+
+def insertar_profesionales(profesionales, lote=LOTE):
+    """Inserta (nombres, apellidos, registro) en lotes con executemany, en una sola transacción.
+
+    Si alguna fila falla se deshace toda la carga. Devuelve la cantidad insertada.
+    """
+    sql = "INSERT INTO Profesionales (nombres, apellidos, registroProfesional) VALUES (%s, %s, %s)"
+    total = 0
+    iterador = iter(profesionales)
+    with conexion_db() as conexion:
+        cursor = conexion.cursor()
+        try:
+            while True:
+                filas = [tuple(fila) for fila in islice(iterador, lote)]
+                if not filas:
+                    break
+                cursor.executemany(sql, filas)
+                total += len(filas)
+            conexion.commit()
+        except Exception:
+            conexion.rollback()
+            raise
+        finally:
+            cursor.close()
+    return total
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src.schemas.persona_schema import PersonaCreate, PersonaUpdate, PersonaOut
 from src.repositories import persona_repository
-from src.database import get_db  # TODO: cuando esté creado
+from src.database import get_db
 
 router = APIRouter(prefix="/personas", tags=["Personas"])
 
@@ -0,0 +1,33 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+import operaciones
+
+router = APIRouter(prefix="/profesionales", tags=["Profesionales"])
+
+def _ndjson(filas):
+    for fila in filas:
+        yield json.dumps(fila, ensure_ascii=False) + "\n"
+
+# Endpoint GET /profesionales (NDJSON en streaming, lectura por lotes del servidor)
+@router.get("/")
+def listar_profesionales(
+    campos: str = Query("id,nombres,apellidos", description="Columnas separadas por coma"),
+    nombres: Optional[str] = None,
+    apellidos: Optional[str] = None,
+    registro: Optional[str] = None,
+    desde_id: Optional[int] = None,
+    limite: Optional[int] = Query(None, ge=1),
+):
+    columnas = tuple(c.strip() for c in campos.split(",") if c.strip())
+    invalidas = set(columnas) - set(operaciones.COLUMNAS_PROFESIONALES)
+    if not columnas or invalidas:
+        raise HTTPException(status_code=400, detail=f"Campos inválidos: {', '.join(sorted(invalidas))}")
+    filas = operaciones.iterar_profesionales(
+        columnas=columnas, nombres=nombres, apellidos=apellidos,
+        registro=registro, desde_id=desde_id, limite=limite,
+    )
+    return StreamingResponse(_ndjson(filas), media_type="application/x-ndjson")
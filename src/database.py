@@ -0,0 +1,4 @@
+# Reutiliza el engine y el pool de conexiones compartido de app.database
+from app.database import engine, SessionLocal, get_db, get_async_engine, get_async_db
+
+__all__ = ["engine", "SessionLocal", "get_db", "get_async_engine", "get_async_db"]
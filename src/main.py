@@ -1,12 +1,36 @@
 from fastapi import FastAPI
-from src.controllers import personas_controller
+from fastapi.responses import PlainTextResponse
+
+import conexion
+from app import instrumentation
+from app.services.cache import get_cache
+from src.controllers import personas_controller, profesionales_controller
 
 app = FastAPI()
 
+# Latencia, consultas y tiempo de BD por endpoint (+ perfilado opcional con X-Profile)
+app.add_middleware(instrumentation.MetricsMiddleware)
+
 # Endpoint de prueba para verificar que la API está viva
 @app.get("/health")
 def healthcheck():
     return {"status": "ok"}
 
-# Registrar el router de personas
+# Métricas en formato Prometheus. Del pool y la caché, solo el estado actual
+# son gauges; el resto (checkouts, hits, evictions...) son contadores
+METRICAS_GAUGE = {"libres", "en_uso", "tamano", "size"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    gauges, contadores = {}, {}
+    for prefijo, datos in (("db_pool_", conexion.get_pool().metricas()), ("cache_", get_cache().stats())):
+        for nombre, valor in datos.items():
+            (gauges if nombre in METRICAS_GAUGE else contadores)[prefijo + nombre] = valor
+    return PlainTextResponse(
+        instrumentation.render_prometheus(gauges, contadores),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+# Registrar los routers
 app.include_router(personas_controller.router)
+app.include_router(profesionales_controller.router)
@@ -0,0 +1,49 @@
+from benchmarks import carga
+
+def _corrida(**metricas):
+    return {"resultados": {"GET /personas/{id}": metricas}}
+
+def test_percentil_rango_mas_cercano():
+    valores = list(range(1, 101))
+    assert carga.percentil(valores, 50) == 50
+    assert carga.percentil(valores, 99) == 99
+    assert carga.percentil([], 99) == 0.0
+
+def test_comparar_detecta_regresiones():
+    base = _corrida(p50_ms=10.0, p95_ms=20.0, p99_ms=30.0, rps=1000.0)
+    igual = _corrida(p50_ms=10.5, p95_ms=21.0, p99_ms=31.0, rps=950.0)
+    peor = _corrida(p50_ms=10.0, p95_ms=25.0, p99_ms=30.0, rps=800.0)
+    assert carga.comparar(igual, base, umbral=0.10) == []
+    assert [(m, round(c, 2)) for _, m, _, _, c in carga.comparar(peor, base, umbral=0.10)] == [
+        ("p95_ms", 0.25), ("rps", -0.2)
+    ]
+
+def test_comparar_marca_errores_nuevos():
+    base = _corrida(p50_ms=10.0, errores=0)
+    con_errores = _corrida(p50_ms=10.0, errores=3)
+    assert carga.comparar(con_errores, base, umbral=0.10) == [
+        ("GET /personas/{id}", "errores", 0, 3, float("inf"))
+    ]
+    assert carga.comparar(base, con_errores, umbral=0.10) == []
+
+def test_comparar_marca_escenarios_ausentes():
+    base = {"resultados": {"GET /health": {"p50_ms": 1.0}, "GET /personas/{id}": {"p50_ms": 1.0}}}
+    actual = {"resultados": {"GET /health": {"p50_ms": 1.0}}}
+    assert carga.comparar(actual, base, umbral=0.10) == [
+        ("GET /personas/{id}", "ausente", None, None, None)
+    ]
+
+def test_medir_escenario_cuenta_excepciones_como_errores():
+    import argparse
+    import asyncio
+
+    import pytest
+    pytest.importorskip("httpx")
+
+    async def app_que_falla(scope, receive, send):
+        raise RuntimeError("fallo no manejado")
+
+    args = argparse.Namespace(semilla=1, clientes=2, calentamiento=2, peticiones=5, peticiones_memoria=2)
+    resultado = asyncio.run(carga.medir_escenario(app_que_falla, lambda rnd: "/", args))
+    assert resultado["peticiones"] == 5
+    assert resultado["errores"] == 5
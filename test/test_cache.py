@@ -0,0 +1,96 @@
+import datetime
+import time
+
+import pytest
+
+from app.services.cache import CacheBackend, MemoryCache, RedisCache
+
+class FakeRedis:
+    """Cliente falso con la interfaz mínima de redis-py que usa RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        valor = self.data.get(key)
+        if valor is None or valor[0] < time.monotonic():
+            return None
+        return valor[1]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (time.monotonic() + (ex or 1e9), value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, patron):
+        prefijo = patron.rstrip("*")
+        return [k for k in self.data if k.startswith(prefijo)]
+
+def test_memory_cache_hit_y_miss():
+    cache = MemoryCache(max_size=10, ttl=60)
+    assert cache.get("a") == (False, None)
+    cache.set("a", 1)
+    assert cache.get("a") == (True, 1)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+def test_memory_cache_desaloja_lru():
+    cache = MemoryCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" pasa a ser la menos usada
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+def test_memory_cache_expira():
+    cache = MemoryCache(max_size=2, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+
+def test_redis_cache_con_cliente_falso():
+    cache = RedisCache(FakeRedis())
+    cache.set("k", {"id": 1})
+    assert cache.get("k") == (True, {"id": 1})
+    cache.delete("k")
+    assert cache.get("k") == (False, None)
+
+def test_redis_cache_guarda_json_con_fechas():
+    cliente = FakeRedis()
+    cache = RedisCache(cliente)
+    valor = {"id": 1, "fechaNacimiento": datetime.date(1990, 1, 31)}
+    cache.set("k", valor)
+    assert isinstance(cliente.data["gestion_salud:k"][1], str)  # JSON, no pickle
+    assert cache.get("k") == (True, valor)
+
+def test_backend_incompleto_no_se_instancia():
+    class SoloGet(CacheBackend):
+        def get(self, key):
+            return False, None
+
+    with pytest.raises(TypeError):
+        SoloGet()
+
+def test_redis_cache_async_usa_otro_hilo():
+    import asyncio
+    import threading
+
+    class RedisLento(FakeRedis):
+        def get(self, key):
+            self.hilo = threading.get_ident()
+            return super().get(key)
+
+    cliente = RedisLento()
+    cache = RedisCache(cliente)
+
+    async def escenario():
+        await cache.aset("k", {"id": 1})
+        return await cache.aget("k"), threading.get_ident()
+
+    resultado, hilo_loop = asyncio.run(escenario())
+    assert resultado == (True, {"id": 1})
+    assert cliente.hilo != hilo_loop  # la E/S no corre en el event loop
@@ -0,0 +1,120 @@
+import sqlite3
+import time
+
+import pytest
+
+from conexion import PoolConexiones, PoolTimeoutError
+
+def crear_sqlite():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+def test_reutiliza_conexion():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=2)
+    c1 = pool.obtener()
+    cruda = c1._conexion
+    c1.close()
+    c2 = pool.obtener()
+    assert c2._conexion is cruda
+    c2.close()
+    metricas = pool.metricas()
+    assert metricas["checkouts"] == 2
+    assert metricas["creadas"] == 1
+    assert metricas["libres"] == 1
+
+def test_timeout_cuando_el_pool_esta_lleno():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=1, timeout=0.05)
+    c1 = pool.obtener()
+    with pytest.raises(PoolTimeoutError):
+        pool.obtener()
+    assert pool.metricas()["timeouts"] == 1
+    assert pool.metricas()["esperas"] == 1
+    c1.close()
+
+def test_descarta_conexion_caida():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=1)
+    c1 = pool.obtener()
+    cruda = c1._conexion
+    c1.close()
+    cruda.close()  # simula una conexión cortada por el servidor
+    c2 = pool.obtener()
+    assert c2._conexion is not cruda
+    assert pool.metricas()["descartadas"] == 1
+    c2.close()
+
+def test_recicla_conexiones_inactivas():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=1, reciclar=0.01)
+    with pool.obtener():
+        pass
+    time.sleep(0.02)
+    with pool.obtener():
+        pass
+    assert pool.metricas()["recicladas"] == 1
+    assert pool.metricas()["creadas"] == 2
+
+def test_reemplazo_de_conexion_caida_no_excede_el_tamano():
+    import threading
+
+    def ping_falla(conexion):
+        raise sqlite3.OperationalError("conexión caída")
+
+    pool = PoolConexiones(creador=crear_sqlite, tamano=1, timeout=2, ping=ping_falla)
+    cerrar_en_hueco = pool._cerrar_en_hueco
+
+    def cerrar_en_hueco_lento(*args):
+        # Agranda la ventana entre cerrar la conexión caída y abrir su reemplazo:
+        # si el hueco se liberara aquí, el otro hilo abriría una segunda conexión
+        cerrar_en_hueco(*args)
+        time.sleep(0.05)
+
+    pool._cerrar_en_hueco = cerrar_en_hueco_lento
+    c1 = pool.obtener()
+    lock, activas, maximo_en_uso = threading.Lock(), [0], []
+
+    def usar():
+        c = pool.obtener()
+        with lock:  # conexiones entregadas a la vez, sin depender de las métricas del pool
+            activas[0] += 1
+            maximo_en_uso.append(activas[0])
+        time.sleep(0.2)  # más que la demora de _cerrar_en_hueco: los usos se solaparían
+        with lock:
+            activas[0] -= 1
+        c.close()
+
+    hilos = [threading.Thread(target=usar) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    while pool.metricas()["esperas"] < 2:  # ambos hilos esperando hueco
+        time.sleep(0.005)
+    c1.close()  # el que la recibe falla el ping y la reemplaza en el mismo hueco
+    for hilo in hilos:
+        hilo.join()
+    assert maximo_en_uso == [1, 1]
+    assert pool.metricas()["en_uso"] == 0
+
+def test_setattr_tras_close():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=1)
+    c = pool.obtener()
+    c.close()
+    with pytest.raises(RuntimeError):
+        c.isolation_level = None
+
+def test_conexion_devuelta_tras_cerrar_el_pool_se_cierra():
+    pool = PoolConexiones(creador=crear_sqlite, tamano=2)
+    c = pool.obtener()
+    cruda = c._conexion
+    pool.cerrar()  # ej. configurar_pool reemplaza el pool con la conexión en uso
+    c.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        cruda.execute("SELECT 1")
+    assert pool.metricas()["libres"] == 0
+    assert pool.metricas()["en_uso"] == 0
+
+def test_checkouts_no_cuenta_conexiones_fallidas():
+    def creador_falla():
+        raise sqlite3.OperationalError("servidor caído")
+
+    pool = PoolConexiones(creador=creador_falla, tamano=1)
+    with pytest.raises(sqlite3.OperationalError):
+        pool.obtener()
+    assert pool.metricas()["checkouts"] == 0
+    assert pool.metricas()["en_uso"] == 0
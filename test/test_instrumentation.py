@@ -0,0 +1,65 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import instrumentation
+from src.main import app
+
+client = TestClient(app)
+
+def test_metrics_expone_latencia_por_endpoint():
+    instrumentation.reset_metricas()
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",endpoint="/health",status="200"} 1' in response.text
+    assert 'http_request_duration_seconds_count{method="GET",endpoint="/health"} 1' in response.text
+
+def test_consultas_lentas_y_n_plus_one(monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(instrumentation, "N_PLUS_ONE_THRESHOLD", 3)
+    instrumentation.reset_metricas()
+    engine = instrumentation.instrumentar_engine(create_engine("sqlite://"))
+    stats = instrumentation.EstadisticasPeticion()
+    token = instrumentation._peticion_actual.set(stats)
+    try:
+        with caplog.at_level(logging.WARNING, logger="gestion_salud.performance"), engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT :doc"), {"doc": "30447476"})
+    finally:
+        instrumentation._peticion_actual.reset(token)
+    assert stats.consultas == 3
+    assert "Posible patrón N+1" in caplog.text
+    assert "30447476" not in caplog.text  # parámetros redactados
+
+def test_sentencia_fallida_no_deja_marcas():
+    engine = instrumentation.instrumentar_engine(create_engine("sqlite://"))
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("SELECT * FROM tabla_inexistente"))
+        except Exception:
+            pass
+        assert conn.info["_inicio_consulta"] == []
+        conn.execute(text("SELECT 1"))  # la siguiente medición no usa una marca vieja
+        assert conn.info["_inicio_consulta"] == []
+
+def test_perfilado_concurrente_responde_409():
+    perfilada = TestClient(instrumentation.MetricsMiddleware(app, profiling_enabled=True))
+    assert instrumentation._perfil_lock.acquire(blocking=False)
+    try:
+        response = perfilada.get("/health", headers={"X-Profile": "1"})
+    finally:
+        instrumentation._perfil_lock.release()
+    assert response.status_code == 409
+    response = perfilada.get("/health", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert response.headers["x-profile-original-status"] == "200"
+
+def test_metricas_de_pool_y_cache_con_su_tipo():
+    texto = client.get("/metrics").text
+    assert "# TYPE db_pool_checkouts_total counter" in texto
+    assert "# TYPE cache_hits_total counter" in texto
+    assert "# TYPE db_pool_en_uso gauge" in texto
+    assert "# TYPE cache_size gauge" in texto
+    assert "db_pool_checkouts gauge" not in texto
@@ -0,0 +1,111 @@
+import pytest
+
+import operaciones
+
+def test_proyeccion_rechaza_columnas_desconocidas():
+    with pytest.raises(ValueError):
+        next(operaciones.iterar_profesionales(columnas=("id", "password")))
+
+def test_prefijo_escapa_comodines():
+    assert operaciones._prefijo("50%_") == r"50\%\_%"
+
+class FakeCursor:
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.filas = []
+
+    def execute(self, sql, parametros=()):
+        self.conexion.ejecutadas.append((sql, parametros))
+        self.filas = list(self.conexion.filas)
+
+    def executemany(self, sql, filas):
+        if self.conexion.fallar_en is not None and len(self.conexion.lotes) == self.conexion.fallar_en:
+            raise RuntimeError("fallo simulado")
+        self.conexion.lotes.append((sql, list(filas)))
+
+    def fetchmany(self, n):
+        self.conexion.fetchmany.append(n)
+        lote, self.filas = self.filas[:n], self.filas[n:]
+        return lote
+
+    def close(self):
+        if self.filas:
+            raise RuntimeError("Unread result found")
+
+class FakeConexion:
+    """Conexión DB-API falsa que registra lo que se ejecuta."""
+
+    def __init__(self, filas=(), fallar_en=None):
+        self.filas = filas
+        self.fallar_en = fallar_en
+        self.ejecutadas, self.lotes, self.fetchmany = [], [], []
+        self.commits = self.rollbacks = 0
+        self.cerrada = False
+
+    def cursor(self, buffered=True):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.cerrada = True
+
+@pytest.fixture
+def pool_falso():
+    import conexion
+
+    anterior, creadas = conexion._pool, []
+
+    def configurar(**kwargs):
+        def creador():
+            creadas.append(FakeConexion(**kwargs))
+            return creadas[-1]
+        return conexion.configurar_pool(creador=creador, tamano=1, timeout=0.1, ping=None), creadas
+
+    yield configurar
+    conexion._pool.cerrar()
+    conexion._pool = anterior
+
+def test_iterar_lee_en_lotes_con_fetchmany(pool_falso):
+    _, creadas = pool_falso(filas=[(i, f"N{i}") for i in range(5)])
+    resultado = list(operaciones.iterar_profesionales(columnas=("id", "nombres"), lote=2))
+    assert resultado == [{"id": i, "nombres": f"N{i}"} for i in range(5)]
+    assert creadas[0].fetchmany == [2, 2, 2, 2]
+
+def test_iterar_arma_filtros_y_parametros(pool_falso):
+    _, creadas = pool_falso()
+    list(operaciones.iterar_profesionales(nombres="Jo_", registro="MPPS-1", desde_id=10, limite=50))
+    sql, parametros = creadas[0].ejecutadas[0]
+    assert sql == ("SELECT id, nombres, apellidos FROM Profesionales WHERE nombres LIKE %s "
+                   "AND registroProfesional = %s AND id > %s ORDER BY id LIMIT %s")
+    assert parametros == (r"Jo\_%", "MPPS-1", 10, 50)
+
+def test_iterar_salida_anticipada_descarta_la_conexion(pool_falso):
+    pool, creadas = pool_falso(filas=[(i,) for i in range(10)])
+    generador = operaciones.iterar_profesionales(columnas=("id",), lote=3)
+    assert next(generador) == {"id": 0}
+    generador.close()  # como un break o un cliente que se desconecta
+    assert creadas[0].cerrada
+    metricas = pool.metricas()
+    assert (metricas["descartadas"], metricas["en_uso"], metricas["libres"]) == (1, 0, 0)
+    # el hueco quedó libre: la siguiente lectura abre una conexión nueva
+    assert next(operaciones.iterar_profesionales(columnas=("id",))) == {"id": 0}
+    assert len(creadas) == 2
+
+def test_insertar_usa_executemany_por_lotes(pool_falso):
+    _, creadas = pool_falso()
+    filas = [(f"N{i}", f"A{i}", f"R{i}") for i in range(5)]
+    assert operaciones.insertar_profesionales(filas, lote=2) == 5
+    assert [len(lote) for _, lote in creadas[0].lotes] == [2, 2, 1]
+    assert creadas[0].commits == 1
+
+def test_insertar_deshace_todo_si_falla_un_lote(pool_falso):
+    _, creadas = pool_falso(fallar_en=1)
+    with pytest.raises(RuntimeError):
+        operaciones.insertar_profesionales([("N", "A", f"R{i}") for i in range(5)], lote=2)
+    assert creadas[0].commits == 0
+    assert creadas[0].rollbacks >= 1
@@ -0,0 +1,148 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.persona import PersonaAtendida
+from app.schemas.persona import PersonaCreate
+from app.services import persona_service
+from app.services.cache import MemoryCache, set_cache
+
+@pytest.fixture
+def db():
+    set_cache(MemoryCache())  # cada prueba usa una BD nueva
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for n in range(25):
+        session.add(PersonaAtendida(
+            tipoDocumento="CI",
+            numeroDocumento=f"V{n:08d}",
+            nombres=f"Nombre{n}",
+            apellidos=f"Apellido{n}",
+            fechaNacimiento=datetime.date(1990, 1, 1),
+            sexo="F",
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+def test_cursor_ida_y_vuelta():
+    assert persona_service.decode_cursor(persona_service.encode_cursor(1234)) == 1234
+
+def test_cursor_invalido():
+    with pytest.raises(ValueError):
+        persona_service.decode_cursor("no-es-un-cursor")
+
+def test_keyset_recorre_todas_las_paginas(db):
+    vistos, cursor = [], None
+    while True:
+        items, cursor = persona_service.get_personas_keyset(db, cursor=cursor, limit=10)
+        vistos.extend(p.id for p in items)
+        if cursor is None:
+            break
+    assert vistos == sorted(vistos)
+    assert len(vistos) == 25
+
+def test_iter_personas_en_lotes(db):
+    assert len(list(persona_service.iter_personas(db, batch_size=7))) == 25
+
+def _nueva(doc):
+    return PersonaCreate(
+        tipoDocumento="CI", numeroDocumento=doc, nombres="Ana", apellidos="Gil",
+        fechaNacimiento=datetime.date(2000, 5, 1), sexo="F",
+    )
+
+def test_bulk_reporta_creadas_y_conflictos(db):
+    personas = [_nueva("N1"), _nueva("V00000003"), _nueva("N2"), _nueva("N1")]
+    reporte = persona_service.bulk_create_personas(db, personas, chunk_size=2)
+    assert [f["estado"] for f in reporte] == ["creada", "conflicto", "creada", "conflicto"]
+    assert [f["fila"] for f in reporte] == [0, 1, 2, 3]
+    assert persona_service.get_persona_by_document(db, "N2") is not None
+
+def test_bulk_invalida_negativas_por_id(db):
+    assert persona_service.get_persona(db, 26) is None  # negativa en caché
+    persona_service.bulk_create_personas(db, [_nueva("N26")])
+    assert persona_service.get_persona(db, 26).numeroDocumento == "N26"
+
+def test_crear_con_negativa_desactualizada(db):
+    assert persona_service.get_persona_by_document(db, "CARRERA") is None  # negativa en caché
+    # Otro proceso (con su propia caché) inserta el mismo documento
+    otra = sessionmaker(bind=db.get_bind())()
+    otra.add(PersonaAtendida(**_nueva("CARRERA").model_dump()))
+    otra.commit()
+    otra.close()
+    with pytest.raises(IntegrityError):
+        persona_service.create_persona(db, _nueva("CARRERA"))
+    assert persona_service.get_persona_by_document(db, "CARRERA") is not None
+
+def test_lookup_usa_cache_e_invalida_al_crear(db):
+    assert persona_service.get_persona_by_document(db, "NUEVO") is None
+    assert persona_service.get_persona_by_document(db, "NUEVO") is None  # negativa en caché
+    persona_service.create_persona(db, _nueva("NUEVO"))
+    persona = persona_service.get_persona_by_document(db, "NUEVO")
+    assert persona is not None
+    assert persona_service.get_persona(db, persona.id).numeroDocumento == "NUEVO"
+    assert persona_service.cache_stats()["hits"] >= 2
+    assert persona_service.deactivate_persona(db, persona.id).estado == "inactivo"
+    assert persona_service.get_persona(db, persona.id).estado == "inactivo"
+
+def test_variantes_async(tmp_path):
+    import asyncio
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def escenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            creada = await persona_service.create_persona_async(db, _nueva("ASYNC1"))
+            encontrada = await persona_service.get_persona_by_document_async(db, "ASYNC1")
+            items, cursor = await persona_service.get_personas_keyset_async(db, limit=10)
+            desactivada = await persona_service.deactivate_persona_async(db, creada.id)
+        await engine.dispose()
+        return creada, encontrada, items, cursor, desactivada
+
+    creada, encontrada, items, cursor, desactivada = asyncio.run(escenario())
+    assert encontrada.id == creada.id
+    assert [p.id for p in items] == [creada.id] and cursor is None
+    assert desactivada.estado == "inactivo"
+
+def test_busqueda_sin_acentos_ni_mayusculas(db):
+    db.add(PersonaAtendida(
+        tipoDocumento="CI", numeroDocumento="30447476", nombres="Mercedes",
+        apellidos="Núñez Peña", fechaNacimiento=datetime.date(2001, 3, 15), sexo="F",
+    ))
+    db.commit()
+    assert [p.apellidos for p in persona_service.search_personas(db, apellidos="nunez")] == ["Núñez Peña"]
+    assert persona_service.search_personas(db, apellidos="NÚÑEZ P", nombres="merc")
+    assert persona_service.search_personas(db, documento="3044")[0].numeroDocumento == "30447476"
+    en_rango = persona_service.search_personas(
+        db, fecha_desde=datetime.date(2001, 1, 1), fecha_hasta=datetime.date(2001, 12, 31)
+    )
+    assert [p.numeroDocumento for p in en_rango] == ["30447476"]
+    assert persona_service.search_personas(db, documento="V%") == []  # sin comodines
+
+def test_busqueda_exacta_primero_y_por_indice(db):
+    for doc, apellidos in (("P2", "Peñaloza"), ("P1", "Peña")):
+        db.add(PersonaAtendida(
+            tipoDocumento="CI", numeroDocumento=doc, nombres="Ana", apellidos=apellidos,
+            fechaNacimiento=datetime.date(1980, 1, 1), sexo="F",
+        ))
+    db.commit()
+    assert [p.apellidos for p in persona_service.search_personas(db, apellidos="pena")] == ["Peña", "Peñaloza"]
+    for filtros in (dict(apellidos="pe"), dict(nombres="an"), dict(documento="V0")):
+        sql = str(persona_service._search_stmt(**filtros).compile(
+            dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+        ))
+        plan = " ".join(r[3] for r in db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql))
+        assert "USING INDEX" in plan and "TEMP B-TREE" not in plan, plan
+
+def test_filas_solo_con_campos_pedidos(db):
+    filas = persona_service.get_personas_filas(db, ["id", "numeroDocumento"], skip=5, limit=3)
+    assert [tuple(f) for f in filas] == [(6, "V00000005"), (7, "V00000006"), (8, "V00000007")]
+    filas, cursor = persona_service.get_personas_keyset_filas(db, ["id"], limit=20)
+    assert len(filas) == 20 and cursor is not None
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_async_db, get_db
+from app.models.base import Base
+from app.models.persona import PersonaAtendida
+from app.schemas.persona import PersonaCreate
+from app.services import persona_service
+from app.services.app.routers import personas
+from app.services.cache import MemoryCache, set_cache
+
+PERSONA = {
+    "tipoDocumento": "CI", "numeroDocumento": "V123", "nombres": "Ana", "apellidos": "Gil",
+    "fechaNacimiento": "2000-05-01", "sexo": "F",
+}
+
+@pytest.fixture
+def bd(tmp_path):
+    set_cache(MemoryCache())
+    ruta = tmp_path / "router.db"
+    engine = create_engine(f"sqlite:///{ruta}")
+    Base.metadata.create_all(engine)
+    SessionSync = sessionmaker(bind=engine)
+    SessionAsync = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{ruta}"), expire_on_commit=False)
+
+    def db_sync():
+        with SessionSync() as db:
+            yield db
+
+    async def db_async():
+        async with SessionAsync() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(personas.router)
+    app.dependency_overrides[get_db] = db_sync
+    app.dependency_overrides[get_async_db] = db_async
+    return TestClient(app), SessionSync
+
+class RequestFalso:
+    def __init__(self, cuerpo: bytes, tamano: int):
+        self.bloques = [cuerpo[i:i + tamano] for i in range(0, len(cuerpo), tamano)]
+
+    async def stream(self):
+        for bloque in self.bloques:
+            yield bloque
+
+def _filas(cuerpo: bytes, tamano: int):
+    async def leer():
+        return [f async for f in personas._leer_filas_csv(RequestFalso(cuerpo, tamano))]
+    return asyncio.run(leer())
+
+def test_csv_con_saltos_de_linea_entre_comillas():
+    cuerpo = '﻿nombres,apellidos\r\n"Ana\r\nMaría",Gil\r\n\r\n"Luis ""L""",Pérez\r\n'.encode()
+    esperado = [["nombres", "apellidos"], ["Ana\r\nMaría", "Gil"], ['Luis "L"', "Pérez"]]
+    for tamano in (1, 7, len(cuerpo)):  # el registro puede quedar partido entre bloques
+        assert _filas(cuerpo, tamano) == esperado
+
+def test_alta_duplicada_tras_cache_negativa_responde_409(bd):
+    client, SessionSync = bd
+    with SessionSync() as db:
+        assert persona_service.get_persona_by_document(db, "V123") is None  # negativa en caché
+    with SessionSync() as otra:  # otro proceso inserta el mismo documento
+        otra.add(PersonaAtendida(**PersonaCreate.model_validate(PERSONA).model_dump()))
+        otra.commit()
+    response = client.post("/personas/", json=PERSONA)
+    assert response.status_code == 409
+    assert client.post("/personas/", json=PERSONA).status_code == 409  # ya sin la negativa
+
+def test_bulk_json_malformado_responde_400(bd):
+    client, _ = bd
+    response = client.post("/personas/bulk", content=b"[{", headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+import datetime
+import json
+
+from starlette.requests import Request
+
+from app import responses
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+FILAS = [(1, "V1", datetime.date(1990, 1, 1))]
+CAMPOS = ["id", "numeroDocumento", "fechaNacimiento"]
+
+def test_serializa_filas_como_json():
+    response = responses.respuesta_rapida(
+        _request(), responses.calcular_etag(FILAS), lambda: responses.filas_a_dicts(FILAS, CAMPOS)
+    )
+    assert response.status_code == 200
+    assert json.loads(response.body) == [{"id": 1, "numeroDocumento": "V1", "fechaNacimiento": "1990-01-01"}]
+
+def test_304_si_el_etag_coincide_sin_serializar():
+    etag = responses.calcular_etag(FILAS)
+
+    def no_serializar():
+        raise AssertionError("no debería serializar")
+
+    response = responses.respuesta_rapida(_request(etag), etag, no_serializar)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag